@@ -0,0 +1,29 @@
+"""add platonus credential cache
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("platonus_profiles", sa.Column("credential_hash", sa.String(length=255), nullable=True))
+    op.add_column(
+        "platonus_profiles",
+        sa.Column("credential_verified_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("platonus_profiles", "credential_verified_at")
+    op.drop_column("platonus_profiles", "credential_hash")
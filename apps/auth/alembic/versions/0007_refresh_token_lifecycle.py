@@ -0,0 +1,121 @@
+"""refresh token lifecycle
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00.000000
+
+Adds `revoked_at`, which the purge job's revoked-token retention counts
+from, and indexes `expires_at` for it. With REFRESH_TOKEN_PARTITIONING=true
+on PostgreSQL the table is instead rebuilt as range-partitioned by month of
+`expires_at`, so the purge job can drop whole months. Unique constraints on
+a partitioned table must contain the partition key, so `jti` is unique per
+`(jti, expires_at)` there; jti values are random 128-bit ids.
+"""
+from __future__ import annotations
+
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def _partitioning_requested() -> bool:
+    enabled = os.getenv("REFRESH_TOKEN_PARTITIONING", "false").strip().lower() in {"1", "true", "yes"}
+    return enabled and op.get_bind().dialect.name == "postgresql"
+
+
+def _is_partitioned() -> bool:
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('refresh_tokens')")
+    ).first() is not None
+
+
+def upgrade() -> None:
+    if not _partitioning_requested():
+        op.add_column("refresh_tokens", sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True))
+        op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+        return
+
+    op.execute("ALTER TABLE refresh_tokens RENAME TO refresh_tokens_legacy")
+    op.execute("ALTER INDEX refresh_tokens_pkey RENAME TO refresh_tokens_legacy_pkey")
+    op.execute("ALTER INDEX ix_refresh_tokens_user_id RENAME TO ix_refresh_tokens_legacy_user_id")
+    op.execute("ALTER INDEX ix_refresh_tokens_jti RENAME TO ix_refresh_tokens_legacy_jti")
+    op.execute(
+        """
+        CREATE TABLE refresh_tokens (
+            id integer NOT NULL DEFAULT nextval('refresh_tokens_id_seq'),
+            user_id integer NOT NULL REFERENCES users (id),
+            jti varchar(64) NOT NULL,
+            revoked boolean NOT NULL DEFAULT false,
+            revoked_at timestamptz,
+            expires_at timestamptz NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, expires_at),
+            UNIQUE (jti, expires_at)
+        ) PARTITION BY RANGE (expires_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id")
+    op.execute("CREATE INDEX ix_refresh_tokens_user_id ON refresh_tokens (user_id)")
+    op.execute("CREATE INDEX ix_refresh_tokens_jti ON refresh_tokens (jti)")
+    # Catches rows outside the monthly partitions the purge job creates ahead.
+    op.execute("CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month date := date_trunc('month', now());
+        BEGIN
+            FOR i IN 0..3 LOOP
+                EXECUTE format(
+                    'CREATE TABLE refresh_tokens_p%s PARTITION OF refresh_tokens FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, 'YYYYMM'), month, month + interval '1 month'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(
+        "INSERT INTO refresh_tokens (id, user_id, jti, revoked, expires_at, created_at) "
+        "SELECT id, user_id, jti, revoked, expires_at, created_at "
+        "FROM refresh_tokens_legacy WHERE expires_at > now()"
+    )
+    op.execute("DROP TABLE refresh_tokens_legacy")
+
+
+def downgrade() -> None:
+    if not (op.get_bind().dialect.name == "postgresql" and _is_partitioned()):
+        op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+        op.drop_column("refresh_tokens", "revoked_at")
+        return
+
+    op.execute("ALTER TABLE refresh_tokens RENAME TO refresh_tokens_partitioned")
+    op.execute("ALTER INDEX refresh_tokens_pkey RENAME TO refresh_tokens_partitioned_pkey")
+    op.execute("ALTER INDEX ix_refresh_tokens_user_id RENAME TO ix_refresh_tokens_partitioned_user_id")
+    op.execute("ALTER INDEX ix_refresh_tokens_jti RENAME TO ix_refresh_tokens_partitioned_jti")
+    op.execute(
+        """
+        CREATE TABLE refresh_tokens (
+            id integer PRIMARY KEY DEFAULT nextval('refresh_tokens_id_seq'),
+            user_id integer NOT NULL REFERENCES users (id),
+            jti varchar(64) NOT NULL,
+            revoked boolean NOT NULL DEFAULT false,
+            expires_at timestamptz NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id")
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index("ix_refresh_tokens_jti", "refresh_tokens", ["jti"], unique=True)
+    op.execute(
+        "INSERT INTO refresh_tokens SELECT id, user_id, jti, revoked, expires_at, created_at "
+        "FROM refresh_tokens_partitioned WHERE expires_at > now()"
+    )
+    op.execute("DROP TABLE refresh_tokens_partitioned")
@@ -0,0 +1,40 @@
+"""add user search index
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00.000000
+
+Trigram indexes for `/auth/users/search` on PostgreSQL: one on the search
+document, whose expression must match `SEARCH_DOCUMENT` in
+`app/repositories/user_repo.py`, and one on `lower(email)`. Other databases
+search in Python and need no index.
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = (
+    "lower(coalesce(full_name, '') || ' ' || coalesce(first_name, '') || ' ' || "
+    "coalesce(last_name, '') || ' ' || split_part(email, '@', 1) || ' ' || "
+    "coalesce(iin, '') || ' ' || coalesce(person_id, ''))"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"CREATE INDEX ix_users_search_trgm ON users USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_email_trgm ON users USING gin ((lower(email)) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_users_email_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_search_trgm")
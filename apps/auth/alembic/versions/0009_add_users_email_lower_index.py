@@ -0,0 +1,26 @@
+"""add users lower(email) index
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00.000000
+
+Serves the case-insensitive `/auth/users/lookup-by-email` and bulk user
+creation.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_lower", table_name="users")
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user, get_db
-from app.models import User
+from app.core.security import jwks
 from app.schemas import (
     LoginRequest,
     LogoutRequest,
@@ -30,8 +30,8 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenPair:
 
 
 @router.post("/auth/login/platonus", response_model=TokenPair)
-def login_platonus(payload: PlatonusLoginRequest, db: Session = Depends(get_db)) -> TokenPair:
-    return auth_service.login_platonus_user(payload, db)
+async def login_platonus(payload: PlatonusLoginRequest, db: Session = Depends(get_db)) -> TokenPair:
+    return await auth_service.login_platonus_user(payload, db)
 
 
 @router.post("/auth/refresh", response_model=TokenPair)
@@ -45,5 +45,12 @@ def logout(payload: LogoutRequest, db: Session = Depends(get_db)) -> dict:
 
 
 @router.get("/auth/me", response_model=UserPublic)
-def me(current_user: User = Depends(get_current_user)) -> UserPublic:
-    return auth_service.user_public_from_model(current_user)
+def me(current_user: UserPublic = Depends(get_current_user)) -> UserPublic:
+    return current_user
+
+
+@router.get("/auth/.well-known/jwks.json")
+def jwks_document(response: Response) -> dict:
+    # Verifiers refetch on an unknown kid, so a short max-age is enough.
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return jwks()
@@ -4,7 +4,6 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db, require_system_admin
-from app.models import User
 from app.schemas import (
     PermissionCreate,
     PermissionPublic,
@@ -13,6 +12,7 @@ from app.schemas import (
     RolePermissionsUpdate,
     RolePublic,
     RoleUpdate,
+    UserPublic,
 )
 from app.services import role_service
 
@@ -25,7 +25,7 @@ router = APIRouter()
 def create_role(
     payload: RoleCreate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> RolePublic:
     return role_service.create_role(payload, db)
 
@@ -35,7 +35,7 @@ def create_role(
 @router.get("/auth/admin/roles", response_model=list[RolePublic])
 def list_roles(
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> list[RolePublic]:
     return role_service.list_roles(db)
 
@@ -47,7 +47,7 @@ def update_role(
     role_id: int,
     payload: RoleUpdate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> RolePublic:
     return role_service.update_role(role_id, payload, db)
 
@@ -58,7 +58,7 @@ def update_role(
 def delete_role(
     role_id: int,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> dict:
     return role_service.delete_role(role_id, db)
 
@@ -81,7 +81,7 @@ def delete_role(
 def create_permission(
     payload: PermissionCreate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> PermissionPublic:
     return role_service.create_permission(payload, db)
 
@@ -91,7 +91,7 @@ def create_permission(
 @router.get("/auth/admin/permissions", response_model=list[PermissionPublic])
 def list_permissions(
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> list[PermissionPublic]:
     return role_service.list_permissions(db)
 
@@ -103,7 +103,7 @@ def update_permission(
     permission_id: int,
     payload: PermissionUpdate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> PermissionPublic:
     return role_service.update_permission(permission_id, payload, db)
 
@@ -114,7 +114,7 @@ def update_permission(
 def delete_permission(
     permission_id: int,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> dict:
     return role_service.delete_permission(permission_id, db)
 
@@ -126,6 +126,6 @@ def update_role_permissions(
     role_id: int,
     payload: RolePermissionsUpdate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> RolePublic:
     return role_service.update_role_permissions(role_id, payload, db)
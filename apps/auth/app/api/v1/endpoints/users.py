@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user, get_db, require_system_admin
-from app.models import User
-from app.schemas import AdminUserCreate, AdminUserUpdate, UserLookupPublic, UserPublic, UserRolesUpdate
-from app.services import user_service
+from app.schemas import (
+    AdminUserBulkCreate,
+    AdminUserBulkResult,
+    AdminUserCreate,
+    AdminUserUpdate,
+    UserEmailLookup,
+    UserEmailLookupResult,
+    UserLookupPublic,
+    UserPublic,
+    UserRolesUpdate,
+)
+from app.services import platonus_credentials_service, user_service
 
 router = APIRouter()
 
@@ -15,20 +24,34 @@ router = APIRouter()
 def lookup_users(
     ids: list[int] = Query(default=[]),
     db: Session = Depends(get_db),
-    _current_user: User = Depends(get_current_user),
+    _current_user: UserPublic = Depends(get_current_user),
 ) -> list[UserLookupPublic]:
     return user_service.lookup_users(ids, db)
 
 
+@router.post("/auth/users/lookup-by-email", response_model=UserEmailLookupResult)
+def lookup_users_by_email(
+    payload: UserEmailLookup,
+    db: Session = Depends(get_db),
+    _current_user: UserPublic = Depends(get_current_user),
+) -> UserEmailLookupResult:
+    return user_service.lookup_users_by_email(payload.emails, db)
+
+
 @router.get("/auth/users/search", response_model=list[UserLookupPublic])
 def search_users(
+    response: Response,
     q: str | None = Query(default=None, max_length=100),
     limit: int = Query(default=20, ge=1, le=50),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, max_length=50),
     db: Session = Depends(get_db),
-    _current_user: User = Depends(get_current_user),
+    _current_user: UserPublic = Depends(get_current_user),
 ) -> list[UserLookupPublic]:
-    return user_service.search_users(q=q, limit=limit, offset=offset, db=db)
+    users, next_cursor = user_service.search_users(q=q, limit=limit, offset=offset, cursor=cursor, db=db)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 
 @router.put("/auth/users/{user_id}/roles", response_model=UserPublic)
@@ -38,7 +61,7 @@ def update_user_roles(
     user_id: int,
     payload: UserRolesUpdate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> UserPublic:
     return user_service.update_user_roles(user_id, payload, db)
 
@@ -48,7 +71,7 @@ def update_user_roles(
 @router.get("/auth/admin/users", response_model=list[UserPublic])
 def list_users(
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> list[UserPublic]:
     return user_service.list_users(db)
 
@@ -59,7 +82,7 @@ def list_users(
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> UserPublic:
     return user_service.get_user(user_id, db)
 
@@ -70,11 +93,22 @@ def get_user(
 def create_user(
     payload: AdminUserCreate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> UserPublic:
     return user_service.create_user(payload, db)
 
 
+@router.post("/auth/users/bulk", response_model=AdminUserBulkResult)
+@router.post("/admin/users/bulk", response_model=AdminUserBulkResult)
+@router.post("/auth/admin/users/bulk", response_model=AdminUserBulkResult)
+def bulk_create_users(
+    payload: AdminUserBulkCreate,
+    db: Session = Depends(get_db),
+    _current_user: UserPublic = Depends(require_system_admin),
+) -> AdminUserBulkResult:
+    return user_service.bulk_create_users(payload, db)
+
+
 @router.put("/auth/users/{user_id}", response_model=UserPublic)
 @router.put("/admin/users/{user_id}", response_model=UserPublic)
 @router.put("/auth/admin/users/{user_id}", response_model=UserPublic)
@@ -82,7 +116,7 @@ def update_user(
     user_id: int,
     payload: AdminUserUpdate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> UserPublic:
     return user_service.update_user(user_id, payload, db)
 
@@ -93,6 +127,25 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(require_system_admin),
+    _current_user: UserPublic = Depends(require_system_admin),
 ) -> dict:
     return user_service.delete_user(user_id, db)
+
+
+@router.delete("/admin/users/{user_id}/platonus-credentials")
+@router.delete("/auth/admin/users/{user_id}/platonus-credentials")
+def forget_platonus_credentials(
+    user_id: int,
+    db: Session = Depends(get_db),
+    _current_user: UserPublic = Depends(require_system_admin),
+) -> dict:
+    return platonus_credentials_service.forget_user(user_id, db)
+
+
+@router.delete("/admin/platonus-credentials")
+@router.delete("/auth/admin/platonus-credentials")
+def forget_all_platonus_credentials(
+    db: Session = Depends(get_db),
+    _current_user: UserPublic = Depends(require_system_admin),
+) -> dict:
+    return platonus_credentials_service.forget_all(db)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolBusy(Exception):
+    pass
+
+
+class _PooledBrowser:
+    def __init__(self, browser: Browser) -> None:
+        self.browser = browser
+        self.active = 0
+        self.uses = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """Warm Chromium instances handing out a fresh context per use.
+
+    At most `max_concurrency` contexts are open across `size` browsers; up to
+    `queue_size` callers wait for one for at most `queue_timeout` seconds,
+    anyone beyond that gets `BrowserPoolBusy`. A browser is replaced after
+    `max_uses` contexts or when it disconnects (crash), once its open
+    contexts are closed.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_concurrency: int,
+        queue_size: int,
+        queue_timeout: float,
+        max_uses: int,
+        headless: bool,
+    ) -> None:
+        self.size = max(1, size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.max_uses = max_uses
+        self.headless = headless
+        self._playwright: Playwright | None = None
+        self._browsers: list[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self.in_use = 0
+        self.waiting = 0
+        self.launched = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_seconds = 0.0
+        self._use_seconds = 0.0
+        self._max_use_seconds = 0.0
+
+    async def start(self) -> None:
+        """Launch the browsers up front; failures are retried on first use."""
+        await self._replenish()
+
+    async def _replenish(self) -> None:
+        try:
+            async with self._lock:
+                while len([b for b in self._browsers if not b.retired]) < self.size:
+                    await self._launch()
+        except Exception as exc:  # noqa: BLE001 - e.g. Chromium not installed in dev
+            logger.warning("browser pool not warmed: %s", exc)
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+            for pooled in browsers:
+                await self._close_browser(pooled)
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @asynccontextmanager
+    async def context(self, **options: Any) -> AsyncIterator[BrowserContext]:
+        queued = time.perf_counter()
+        if not self._slots.locked():
+            await self._slots.acquire()
+        elif self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise BrowserPoolBusy()
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise BrowserPoolBusy() from None
+            finally:
+                self.waiting -= 1
+
+        pooled: _PooledBrowser | None = None
+        started = time.perf_counter()
+        ok = False
+        try:
+            pooled = await self._checkout()
+            self.in_use += 1
+            self._wait_seconds += started - queued
+            context = await pooled.browser.new_context(**options)
+            try:
+                yield context
+                ok = True
+            finally:
+                await _close_quietly(context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if pooled is not None:
+                self.in_use -= 1
+                await self._checkin(pooled)
+            self._slots.release()
+            if ok:
+                self.completed += 1
+                self._use_seconds += elapsed
+                self._max_use_seconds = max(self._max_use_seconds, elapsed)
+            else:
+                self.failed += 1
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._lock:
+            live = [b for b in self._browsers if not b.retired]
+            if len(live) < self.size:
+                live.append(await self._launch())
+            pooled = min(live, key=lambda b: b.active)
+            pooled.active += 1
+            return pooled
+
+    async def _checkin(self, pooled: _PooledBrowser) -> None:
+        async with self._lock:
+            pooled.active -= 1
+            pooled.uses += 1
+            if not pooled.retired and (pooled.uses >= self.max_uses or not pooled.browser.is_connected()):
+                pooled.retired = True
+                self.recycled += 1
+            if pooled.retired and pooled.active == 0 and pooled in self._browsers:
+                self._browsers.remove(pooled)
+                await self._close_browser(pooled)
+            replace = pooled.retired
+        if replace:
+            self._schedule_replenish()
+
+    def _schedule_replenish(self) -> None:
+        # Warm the replacement now instead of on the next login.
+        task = asyncio.create_task(self._replenish())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _launch(self) -> _PooledBrowser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        pooled = _PooledBrowser(browser)
+        browser.on("disconnected", lambda _: self._on_disconnected(pooled))
+        self._browsers.append(pooled)
+        self.launched += 1
+        return pooled
+
+    def _on_disconnected(self, pooled: _PooledBrowser) -> None:
+        if not pooled.retired:
+            pooled.retired = True
+            self.crashed += 1
+            logger.warning("pooled browser disconnected; it will be replaced")
+        if pooled.active == 0 and pooled in self._browsers:
+            self._browsers.remove(pooled)
+            self._schedule_replenish()
+
+    @staticmethod
+    async def _close_browser(pooled: _PooledBrowser) -> None:
+        pooled.retired = True
+        if pooled.browser.is_connected():
+            await _close_quietly(pooled.browser)
+
+    def snapshot(self) -> dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "browsers": len([b for b in self._browsers if not b.retired]),
+            "size": self.size,
+            "max_concurrency": self.max_concurrency,
+            "in_use": self.in_use,
+            "utilisation": round(self.in_use / self.max_concurrency, 4),
+            "waiting": self.waiting,
+            "queue_size": self.queue_size,
+            "launched": self.launched,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": round(self._wait_seconds / finished * 1000, 1) if finished else 0.0,
+            "avg_login_ms": round(self._use_seconds / self.completed * 1000, 1) if self.completed else 0.0,
+            "max_login_ms": round(self._max_use_seconds * 1000, 1),
+        }
+
+
+async def _close_quietly(closable: Any) -> None:
+    try:
+        await closable.close()
+    except Exception:  # noqa: BLE001 - the browser may already be gone
+        pass
+
+
+browser_pool = BrowserPool(
+    size=settings.platonus_browsers,
+    max_concurrency=settings.platonus_max_concurrency,
+    queue_size=settings.platonus_queue_size,
+    queue_timeout=settings.platonus_queue_timeout_seconds,
+    max_uses=settings.platonus_browser_max_uses,
+    headless=settings.platonus_headless,
+)
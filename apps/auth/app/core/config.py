@@ -12,17 +12,47 @@ class Settings:
         )
         self.secret_key = os.getenv("SECRET_KEY", "dev-secret-change-me")
         self.algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+        # RS*/ES* sign with <kid>.pem keys from this directory; see app/core/keys.py.
+        self.jwt_keys_dir = os.getenv("JWT_KEYS_DIR", "")
+        self.jwt_active_kid = os.getenv("JWT_ACTIVE_KID", "")
+        # Keep accepting HS256 tokens signed with SECRET_KEY while switching over.
+        self.jwt_accept_hs256 = os.getenv("JWT_ACCEPT_HS256", "true").strip().lower() in {"1", "true", "yes"}
         self.access_token_expires_minutes = int(
             os.getenv("ACCESS_TOKEN_EXPIRES_MINUTES", "15")
         )
         self.refresh_token_expires_days = int(
             os.getenv("REFRESH_TOKEN_EXPIRES_DAYS", "30")
         )
+        # Background purge of expired refresh tokens; 0 disables it.
+        self.refresh_token_purge_interval_seconds = float(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL", "3600"))
+        self.refresh_token_purge_batch_size = int(os.getenv("REFRESH_TOKEN_PURGE_BATCH_SIZE", "1000"))
+        self.refresh_token_purge_pause_seconds = float(os.getenv("REFRESH_TOKEN_PURGE_PAUSE", "0.1"))
+        self.refresh_token_revoked_retention_hours = float(
+            os.getenv("REFRESH_TOKEN_REVOKED_RETENTION_HOURS", "24")
+        )
         self.system_admin_role = os.getenv("SYSTEM_ADMIN_ROLE", "system_admin")
+        # bcrypt runs in worker processes; 0 workers hashes inline.
+        self.bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+        self.password_hash_workers = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.password_hash_max_pending = int(
+            os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(1, self.password_hash_workers) * 16))
+        )
+        self.password_hash_queue_timeout_seconds = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+        # Per-process /auth/me snapshots; invalidated on user/role changes, 0 disables.
+        self.user_cache_ttl_seconds = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+        self.user_cache_max_entries = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
 
         self.platonus_base_url = os.getenv("PLATONUS_BASE_URL", "https://platonus.tau-edu.kz").rstrip("/")
         self.platonus_headless = os.getenv("PLATONUS_HEADLESS", "true").strip().lower() not in {"0", "false", "no"}
         self.platonus_timeout_ms = int(os.getenv("PLATONUS_TIMEOUT_MS", "60000"))
+        # Warm Chromium pool shared by Platonus logins.
+        self.platonus_browsers = int(os.getenv("PLATONUS_BROWSERS", "2"))
+        self.platonus_max_concurrency = int(os.getenv("PLATONUS_MAX_CONCURRENCY", "4"))
+        self.platonus_queue_size = int(os.getenv("PLATONUS_QUEUE_SIZE", "20"))
+        self.platonus_queue_timeout_seconds = float(os.getenv("PLATONUS_QUEUE_TIMEOUT", "15"))
+        self.platonus_browser_max_uses = int(os.getenv("PLATONUS_BROWSER_MAX_USES", "50"))
+        # Opt-in: a password Platonus accepted is re-checked locally for this long.
+        self.platonus_credential_cache_ttl_seconds = float(os.getenv("PLATONUS_CREDENTIAL_CACHE_TTL", "0"))
         self.platonus_debug = os.getenv("PLATONUS_DEBUG", "false").strip().lower() in {"1", "true", "yes"}
 
 
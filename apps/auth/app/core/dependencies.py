@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import settings
 from app.core.security import TokenError, decode_token
+from app.core.user_cache import user_cache
 from app.db import SessionLocal
-from app.models import User
+from app.models import Role, User
+from app.schemas import UserPublic
+from app.services.auth_service import collect_roles_permissions
 
 security = HTTPBearer()
 
@@ -20,10 +24,25 @@ def get_db() -> Session:
         db.close()
 
 
+def _load_user_snapshot(user_id: int, db: Session) -> UserPublic | None:
+    user = db.execute(
+        select(User)
+        .where(User.id == user_id)
+        .options(selectinload(User.roles).selectinload(Role.permissions))
+    ).scalar_one_or_none()
+    if not user:
+        return None
+    roles, permissions = collect_roles_permissions(user)
+    # Not validated: Platonus accounts can carry placeholder emails
+    # (`@local.invalid`) that EmailStr rejects.
+    fields = {name: getattr(user, name) for name in UserPublic.model_fields if name not in ("roles", "permissions")}
+    return UserPublic.model_construct(**fields, roles=roles, permissions=permissions)
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
+) -> UserPublic:
     token = credentials.credentials
     try:
         payload = decode_token(token)
@@ -37,15 +56,15 @@ def get_current_user(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_token")
 
-    user = db.get(User, int(user_id))
+    user = user_cache.get_or_load(int(user_id), lambda: _load_user_snapshot(int(user_id), db))
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="user_inactive")
 
     return user
 
 
-def require_system_admin(current_user: User = Depends(get_current_user)) -> User:
-    is_admin = any(role.name == settings.system_admin_role for role in current_user.roles)
+def require_system_admin(current_user: UserPublic = Depends(get_current_user)) -> UserPublic:
+    is_admin = settings.system_admin_role in current_user.roles
     if not is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="admin_required")
     return current_user
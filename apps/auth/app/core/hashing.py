@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Hashes outside the configured cost are flagged for rehash in either direction.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_desired_rounds=settings.bcrypt_rounds,
+    bcrypt__max_desired_rounds=settings.bcrypt_rounds,
+)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_and_update(password: str, hashed: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(password, hashed)
+
+
+class PasswordHashingBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded pool of worker processes.
+
+    Request threads only wait on the result, so a login burst uses every core
+    without holding the GIL that `/auth/me` needs. At most `max_pending` jobs
+    are queued or running; callers beyond that wait up to `queue_timeout`
+    and then get `PasswordHashingBusy`. `workers=0` hashes inline.
+    """
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._stats_lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_observed_pending = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def start(self) -> None:
+        if self.workers <= 0:
+            return
+        with self._executor_lock:
+            if self._executor is not None:
+                return
+            # Spawned, not forked: the server process has running threads.
+            executor = self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        # Start the workers now rather than on the first login.
+        for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.workers <= 0:
+            return fn(*args)
+        if self._executor is None:
+            self.start()
+        executor = self._executor
+
+        queued = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._stats_lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+        with self._stats_lock:
+            self.pending += 1
+            self.max_observed_pending = max(self.max_observed_pending, self.pending)
+        try:
+            started = time.perf_counter()
+            result, run_seconds = executor.submit(_timed, fn, *args).result()
+        finally:
+            self._slots.release()
+            with self._stats_lock:
+                self.pending -= 1
+        with self._stats_lock:
+            self.completed += 1
+            # Time spent queued behind other jobs, in this process or the pool.
+            self._wait_seconds += (started - queued) + (time.perf_counter() - started - run_seconds)
+            self._run_seconds += run_seconds
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._stats_lock:
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "max_observed_pending": self.max_observed_pending,
+                "completed": completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2) if completed else 0.0,
+                "avg_hash_ms": round(self._run_seconds / completed * 1000, 2) if completed else 0.0,
+            }
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    queue_timeout=settings.password_hash_queue_timeout_seconds,
+)
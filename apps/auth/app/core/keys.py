@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from jose import jwk
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_pem: str
+    public_jwk: dict[str, Any]
+
+
+def _load_key(path: Path, algorithm: str) -> SigningKey:
+    private_pem = path.read_text(encoding="utf-8")
+    public = jwk.construct(private_pem, algorithm).public_key().to_dict()
+    public.update({"kid": path.stem, "use": "sig", "alg": algorithm})
+    return SigningKey(kid=path.stem, algorithm=algorithm, private_pem=private_pem, public_jwk=public)
+
+
+class KeyRing:
+    """Private keys from `<keys_dir>/<kid>.pem`; one signs, all verify.
+
+    Rotation: add the new key file and point `JWT_ACTIVE_KID` at it. Keep the
+    old file until the last token it signed has expired so it stays in the
+    JWKS document and verifiers keep accepting those tokens.
+    """
+
+    def __init__(self, keys: list[SigningKey], active_kid: str = "") -> None:
+        self.keys = {key.kid: key for key in keys}
+        if active_kid and active_kid not in self.keys:
+            raise RuntimeError(f"JWT_ACTIVE_KID {active_kid!r} has no key file")
+        # Key files are expected to be named so the newest sorts last.
+        self.active_kid = active_kid or (sorted(self.keys)[-1] if self.keys else "")
+
+    @classmethod
+    def load(cls, keys_dir: str, algorithm: str, active_kid: str = "") -> "KeyRing":
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            return cls([])
+        directory = Path(keys_dir) if keys_dir else None
+        if directory is None or not directory.is_dir():
+            raise RuntimeError(f"JWT_ALGORITHM={algorithm} requires JWT_KEYS_DIR with <kid>.pem keys")
+        keys = [_load_key(path, algorithm) for path in sorted(directory.glob("*.pem"))]
+        if not keys:
+            raise RuntimeError(f"no *.pem keys found in {keys_dir}")
+        return cls(keys, active_kid)
+
+    @property
+    def asymmetric(self) -> bool:
+        return bool(self.keys)
+
+    def signing_key(self) -> SigningKey:
+        return self.keys[self.active_kid]
+
+    def get(self, kid: str) -> SigningKey | None:
+        return self.keys.get(kid)
+
+    def jwks(self) -> dict[str, Any]:
+        return {"keys": [key.public_jwk for key in self.keys.values()]}
@@ -5,11 +5,12 @@ from typing import Any
 from uuid import uuid4
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.config import settings
+from app.core.hashing import hash_password, password_hasher, verify_and_update
+from app.core.keys import KeyRing
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+key_ring = KeyRing.load(settings.jwt_keys_dir, settings.algorithm, settings.jwt_active_kid)
 
 
 class TokenError(Exception):
@@ -17,21 +18,29 @@ class TokenError(Exception):
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return verify_password_and_update(plain_password, hashed_password)[0]
+
+
+def verify_password_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password; the second item is a new hash when the stored one is outdated."""
     if len(plain_password.encode("utf-8")) > 72:
-        return False
-    return pwd_context.verify(plain_password, hashed_password)
+        return False, None
+    return password_hasher.run(verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     if len(password.encode("utf-8")) > 72:
         raise ValueError("password_too_long")
-    return pwd_context.hash(password)
+    return password_hasher.run(hash_password, password)
 
 
 def _create_token(payload: dict[str, Any], expires_delta: timedelta) -> str:
     to_encode = payload.copy()
     expire = datetime.now(timezone.utc) + expires_delta
     to_encode.update({"exp": expire})
+    if key_ring.asymmetric:
+        key = key_ring.signing_key()
+        return jwt.encode(to_encode, key.private_pem, algorithm=key.algorithm, headers={"kid": key.kid})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
@@ -57,8 +66,29 @@ def create_refresh_token(user_id: int) -> tuple[str, str, datetime]:
     return token, jti, datetime.now(timezone.utc) + expires
 
 
+def _verification_key(token: str) -> tuple[Any, str]:
+    if not key_ring.asymmetric:
+        return settings.secret_key, settings.algorithm
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as exc:
+        raise TokenError("invalid_token") from exc
+    key = key_ring.get(header.get("kid") or "")
+    if key is not None:
+        return key.public_jwk, key.algorithm
+    if header.get("alg") == "HS256" and settings.jwt_accept_hs256:
+        return settings.secret_key, "HS256"
+    raise TokenError("invalid_token")
+
+
 def decode_token(token: str) -> dict[str, Any]:
+    key, algorithm = _verification_key(token)
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        return jwt.decode(token, key, algorithms=[algorithm])
     except JWTError as exc:
         raise TokenError("invalid_token") from exc
+
+
+def jwks() -> dict[str, Any]:
+    """Public keys for offline verification; empty while tokens are HS256."""
+    return key_ring.jwks()
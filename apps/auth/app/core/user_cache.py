@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.schemas import UserPublic
+
+
+class UserCache:
+    """LRU of `/auth/me` snapshots (profile, active flag, roles, permissions).
+
+    Services call `invalidate` for a changed user and `clear` for role or
+    permission changes. The TTL only bounds staleness across processes, which
+    do not see each other's invalidations.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[UserPublic, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a load that raced with one is not stored.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get_or_load(self, user_id: int, load: Callable[[], UserPublic | None]) -> UserPublic | None:
+        if not self.enabled:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0].model_copy(deep=True)
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            generation = self._generation
+
+        user = load()
+        if user is None:
+            return None
+        with self._lock:
+            if generation == self._generation:
+                self._entries[user_id] = (user, time.monotonic() + self.ttl)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return user.model_copy(deep=True)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+user_cache = UserCache(
+    max_entries=settings.user_cache_max_entries,
+    ttl=settings.user_cache_ttl_seconds,
+)
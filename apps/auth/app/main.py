@@ -1,20 +1,89 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+import logging
+
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 
 from app.api.v1.router import router as api_v1_router
+from app.core.browser_pool import browser_pool
 from app.core.config import settings
+from app.core.hashing import PasswordHashingBusy, password_hasher
+from app.core.tracing import TracingMiddleware
+from app.core.user_cache import user_cache
 from app.services import auth_service
 
 app = FastAPI(title="Auth Service", version="1.0.0")
+logger = logging.getLogger(__name__)
 app.include_router(api_v1_router)
+app.add_middleware(TracingMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
+    password_hasher.start()
     auth_service.ensure_system_admin_role()
 
 
+@app.on_event("startup")
+async def start_browser_pool() -> None:
+    await browser_pool.start()
+
+
+async def purge_refresh_tokens_periodically() -> None:
+    while True:
+        try:
+            deleted = await run_in_threadpool(auth_service.purge_refresh_tokens)
+            if deleted:
+                logger.info("purged %s refresh tokens", deleted)
+        except Exception:  # noqa: BLE001 - keep the schedule on database hiccups
+            logger.exception("refresh token purge failed")
+        await asyncio.sleep(settings.refresh_token_purge_interval_seconds)
+
+
+@app.on_event("startup")
+async def start_token_purge() -> None:
+    app.state.token_purge = None
+    if settings.refresh_token_purge_interval_seconds > 0:
+        app.state.token_purge = asyncio.create_task(purge_refresh_tokens_periodically())
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+async def stop_token_purge() -> None:
+    if app.state.token_purge is not None:
+        app.state.token_purge.cancel()
+
+
+@app.on_event("shutdown")
+async def close_browser_pool() -> None:
+    await browser_pool.close()
+
+
+@app.exception_handler(PasswordHashingBusy)
+def password_hashing_busy(request: Request, exc: PasswordHashingBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "password_hashing_busy"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok", "env": settings.env}
+
+
+@app.get("/metrics")
+def metrics() -> dict:
+    return {
+        "password_hashing": password_hasher.snapshot(),
+        "platonus_browsers": browser_pool.snapshot(),
+        "user_cache": user_cache.snapshot(),
+    }
@@ -25,6 +25,11 @@ class PlatonusProfile(Base):
     roles: Mapped[list[str]] = mapped_column(JSONB, default=list)
     info: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
 
+    # Opt-in cache of the last password Platonus accepted (bcrypt), see
+    # platonus_credentials_service.
+    credential_hash: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    credential_verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -1,3 +1,129 @@
 from __future__ import annotations
 
 # Database access for refresh tokens.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models import RefreshToken
+
+
+def add(db: Session, user_id: int, jti: str, expires_at: datetime) -> None:
+    db.add(RefreshToken(user_id=user_id, jti=jti, expires_at=expires_at))
+
+
+def revoke_active(db: Session, jti: str, user_id: int, now: datetime) -> bool:
+    """Revoke a live token in one statement; False if it was already used or expired.
+
+    Of concurrent refreshes with the same token exactly one gets True.
+    """
+    revoked = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked=True, revoked_at=now)
+        .returning(RefreshToken.id)
+    ).first()
+    return revoked is not None
+
+
+def revoke(db: Session, jti: str, now: datetime) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == jti, RefreshToken.revoked.is_(False))
+        .values(revoked=True, revoked_at=now)
+    )
+
+
+def purge_batch(db: Session, now: datetime, revoked_retention: timedelta, batch_size: int) -> int:
+    """Delete up to `batch_size` expired tokens, or tokens revoked more than
+    `revoked_retention` ago, and commit.
+    """
+    # Tokens revoked before `revoked_at` existed fall back to their issue time.
+    revoked_at = func.coalesce(RefreshToken.revoked_at, RefreshToken.created_at)
+    doomed = (
+        select(RefreshToken.id)
+        .where(
+            or_(
+                RefreshToken.expires_at <= now,
+                RefreshToken.revoked.is_(True) & (revoked_at <= now - revoked_retention),
+            )
+        )
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    deleted = db.execute(delete(RefreshToken).where(RefreshToken.id.in_(doomed))).rowcount
+    db.commit()
+    return deleted or 0
+
+
+# Range partitions by month of `expires_at`; only used once migration 0007
+# has partitioned the table (REFRESH_TOKEN_PARTITIONING=true, PostgreSQL).
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('refresh_tokens')")
+    ).first() is not None
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    return _month_start(_month_start(value) + timedelta(days=32))
+
+
+def partition_name(month: datetime) -> str:
+    return f"refresh_tokens_p{month:%Y%m}"
+
+
+def ensure_partitions(db: Session, until: datetime, now: datetime) -> list[str]:
+    """Create the monthly partitions covering `now` .. `until`."""
+    created = []
+    month = _month_start(now)
+    while month <= until:
+        upper = _next_month(month)
+        name = partition_name(month)
+        exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists is None:
+            # DDL takes no bind parameters; both bounds are generated here.
+            db.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF refresh_tokens "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                )
+            )
+            created.append(name)
+        month = upper
+    db.commit()
+    return created
+
+
+def drop_expired_partitions(db: Session, now: datetime) -> list[str]:
+    """Drop monthly partitions whose whole range has expired."""
+    names = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('refresh_tokens') "
+            "AND c.relname LIKE 'refresh\\_tokens\\_p%'"
+        )
+    ).scalars().all()
+    dropped = []
+    for name in sorted(names):
+        month = datetime.strptime(name.rsplit("_p", 1)[1], "%Y%m").replace(tzinfo=now.tzinfo)
+        if _next_month(month) <= now:
+            db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    db.commit()
+    return dropped
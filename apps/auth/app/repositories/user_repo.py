@@ -1,3 +1,171 @@
 from __future__ import annotations
 
 # Database access for users.
+
+import re
+
+from sqlalchemy import Integer, case, cast, func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import User
+
+# Lower-cased text that fuzzy search matches against. It has only the local
+# part of the email, so the shared domain does not make every address on it
+# look similar. Migration 0008 builds a trigram index on exactly this
+# expression, and one on `lower(email)` for substring matches; keep them in
+# sync.
+SEARCH_DOCUMENT = (
+    "lower(coalesce(full_name, '') || ' ' || coalesce(first_name, '') || ' ' || "
+    "coalesce(last_name, '') || ' ' || split_part(email, '@', 1) || ' ' || "
+    "coalesce(iin, '') || ' ' || coalesce(person_id, ''))"
+)
+# pg_trgm's default `word_similarity_threshold`, also used by the fallback.
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+# Scores are `tier * 1000 + word similarity * 1000`: exact email, then a
+# prefix of a name or email, then anything else that matched.
+_EXACT = 2
+_PREFIX = 1
+
+
+def search(
+    db: Session,
+    query: str | None,
+    limit: int,
+    offset: int = 0,
+    after: tuple[int, int] | None = None,
+) -> list[tuple[User, int]]:
+    """Active users matching `query` with their score, best first.
+
+    Ordered by `(score desc, id desc)`; `after` is the `(score, id)` of the
+    last row of the previous page. An empty query lists the newest users.
+    Single words and anything with `@` match as substrings only; queries of
+    several words also match fuzzily.
+    """
+    query = " ".join((query or "").lower().split())
+    if not query or query.isdigit():
+        return _search_exact(db, query, limit, offset, after)
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_trigram(db, query, limit, offset, after)
+    return _search_python(db, query, limit, offset, after)
+
+
+def _search_exact(
+    db: Session, query: str, limit: int, offset: int, after: tuple[int, int] | None
+) -> list[tuple[User, int]]:
+    stmt = select(User).where(User.is_active.is_(True))
+    score = 0
+    if query:
+        score = _EXACT * 1000
+        stmt = stmt.where(or_(User.id == int(query), User.iin == query, User.person_id == query))
+    if after is not None:
+        if after[0] < score:
+            return []
+        if after[0] == score:
+            stmt = stmt.where(User.id < after[1])
+    users = db.execute(stmt.order_by(User.id.desc()).limit(limit).offset(offset)).scalars().all()
+    return [(user, score) for user in users]
+
+
+def _search_trigram(
+    db: Session, query: str, limit: int, offset: int, after: tuple[int, int] | None
+) -> list[tuple[User, int]]:
+    document = literal_column(SEARCH_DOCUMENT)
+    prefix = _escape_like(query) + "%"
+    tier = case(
+        (func.lower(User.email) == query, _EXACT),
+        (
+            or_(
+                func.lower(User.email).like(prefix, escape="\\"),
+                func.lower(User.full_name).like(prefix, escape="\\"),
+                func.lower(User.first_name).like(prefix, escape="\\"),
+                func.lower(User.last_name).like(prefix, escape="\\"),
+            ),
+            _PREFIX,
+        ),
+        else_=0,
+    )
+    similarity = cast(func.floor(func.word_similarity(query, document) * 1000), Integer)
+    score = (tier * 1000 + similarity).label("score")
+
+    # Every condition is answered by one of the gin_trgm_ops indexes.
+    contains = f"%{_escape_like(query)}%"
+    conditions = [
+        document.like(contains, escape="\\"),
+        func.lower(User.email).like(contains, escape="\\"),
+    ]
+    if _fuzzy(query):
+        conditions.append(literal(query).op("<%")(document))
+    stmt = select(User, score).where(User.is_active.is_(True), or_(*conditions))
+    if after is not None:
+        value = score.element
+        stmt = stmt.where(or_(value < after[0], (value == after[0]) & (User.id < after[1])))
+    stmt = stmt.order_by(score.desc(), User.id.desc()).limit(limit).offset(offset)
+    return [(user, value) for user, value in db.execute(stmt).all()]
+
+
+def _search_python(
+    db: Session, query: str, limit: int, offset: int, after: tuple[int, int] | None
+) -> list[tuple[User, int]]:
+    # SQLite has no trigram index: score every active user with the same rules.
+    query_trigrams = trigrams(query)
+    fuzzy = _fuzzy(query)
+    scored = []
+    for user in db.execute(select(User).where(User.is_active.is_(True))).scalars():
+        document = search_document(user)
+        email = user.email.lower()
+        similarity = word_similarity(query_trigrams, trigrams(document))
+        if query not in document and query not in email and not (
+            fuzzy and similarity >= WORD_SIMILARITY_THRESHOLD
+        ):
+            continue
+        if email == query:
+            tier = _EXACT
+        elif any(
+            (value or "").lower().startswith(query)
+            for value in (email, user.full_name, user.first_name, user.last_name)
+        ):
+            tier = _PREFIX
+        else:
+            tier = 0
+        score = tier * 1000 + int(similarity * 1000)
+        if after is None or (score, user.id) < after:
+            scored.append((user, score))
+    scored.sort(key=lambda item: (item[1], item[0].id), reverse=True)
+    return scored[offset:offset + limit]
+
+
+def search_document(user: User) -> str:
+    """Python twin of `SEARCH_DOCUMENT`."""
+    local_part = user.email.split("@", 1)[0]
+    parts = (user.full_name, user.first_name, user.last_name, local_part, user.iin, user.person_id)
+    return " ".join(part or "" for part in parts).lower()
+
+
+def _fuzzy(query: str) -> bool:
+    # Single words and addresses match as substrings only.
+    return "@" not in query and " " in query
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams the way pg_trgm extracts them: per word, padded `"  word "`."""
+    result = set()
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def word_similarity(query_trigrams: set[str], document_trigrams: set[str]) -> float:
+    """Share of the query's trigrams found in the document.
+
+    An upper bound of pg_trgm's `word_similarity`, which also requires them
+    to come from one contiguous stretch of the document.
+    """
+    if not query_trigrams:
+        return 0.0
+    return len(query_trigrams & document_trigrams) / len(query_trigrams)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -9,9 +9,14 @@ from app.schemas.role import (
     RoleUpdate,
 )
 from app.schemas.user import (
+    AdminUserBulkCreate,
+    AdminUserBulkItem,
+    AdminUserBulkResult,
     AdminUserCreate,
     AdminUserUpdate,
     UserCreate,
+    UserEmailLookup,
+    UserEmailLookupResult,
     UserLookupPublic,
     UserPublic,
     UserRolesUpdate,
@@ -30,9 +35,14 @@ __all__ = [
     "RolePermissionsUpdate",
     "RolePublic",
     "RoleUpdate",
+    "AdminUserBulkCreate",
+    "AdminUserBulkItem",
+    "AdminUserBulkResult",
     "AdminUserCreate",
     "AdminUserUpdate",
     "UserCreate",
+    "UserEmailLookup",
+    "UserEmailLookupResult",
     "UserLookupPublic",
     "UserPublic",
     "UserRolesUpdate",
@@ -76,5 +76,39 @@ class UserLookupPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserEmailLookup(BaseModel):
+    emails: list[str] = Field(default_factory=list, max_length=5000)
+
+
+class UserEmailLookupResult(BaseModel):
+    # Keyed by lower-cased email.
+    users: dict[str, int] = Field(default_factory=dict)
+    missing: list[str] = Field(default_factory=list)
+
+
+class AdminUserBulkItem(BaseModel):
+    # Validated per item so one bad address does not reject the whole batch.
+    email: str = Field(max_length=320)
+    full_name: str | None = Field(default=None, max_length=255)
+    first_name: str | None = Field(default=None, max_length=100)
+    last_name: str | None = Field(default=None, max_length=100)
+    department_id: int | None = None
+    role: str | None = Field(default=None, max_length=100)
+    iin: str | None = Field(default=None, min_length=12, max_length=12, pattern=r"^\d{12}$")
+    person_id: str | None = Field(default=None, max_length=50)
+    is_active: bool = True
+
+
+class AdminUserBulkCreate(BaseModel):
+    users: list[AdminUserBulkItem] = Field(max_length=5000)
+    role_ids: list[int] = Field(default_factory=list)
+
+
+class AdminUserBulkResult(BaseModel):
+    created: dict[str, int] = Field(default_factory=dict)
+    existing: dict[str, int] = Field(default_factory=dict)
+    invalid: list[str] = Field(default_factory=list)
+
+
 class UserRolesUpdate(BaseModel):
     role_ids: list[int] = Field(default_factory=list)
@@ -6,7 +6,9 @@ from app.core.security import (
     create_refresh_token,
     decode_token,
     get_password_hash,
+    jwks,
     verify_password,
+    verify_password_and_update,
 )
 
 __all__ = [
@@ -15,5 +17,7 @@ __all__ = [
     "create_refresh_token",
     "decode_token",
     "get_password_hash",
+    "jwks",
     "verify_password",
+    "verify_password_and_update",
 ]
@@ -1,3 +1,15 @@
-from app.services import auth_service, platonus_service, role_service, user_service
+from app.services import (
+    auth_service,
+    platonus_credentials_service,
+    platonus_service,
+    role_service,
+    user_service,
+)
 
-__all__ = ["auth_service", "platonus_service", "role_service", "user_service"]
+__all__ = [
+    "auth_service",
+    "platonus_credentials_service",
+    "platonus_service",
+    "role_service",
+    "user_service",
+]
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import re
 import secrets
+import time
 
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.browser_pool import BrowserPoolBusy
 from app.core.config import settings
 from app.core.security import (
     TokenError,
@@ -15,10 +18,12 @@ from app.core.security import (
     create_refresh_token,
     decode_token,
     get_password_hash,
-    verify_password,
+    verify_password_and_update,
 )
+from app.core.user_cache import user_cache
 from app.db import SessionLocal
-from app.models import PlatonusProfile, RefreshToken, Role, User
+from app.models import PlatonusProfile, Role, User
+from app.repositories import token_repo
 from app.schemas import (
     LoginRequest,
     LogoutRequest,
@@ -28,7 +33,7 @@ from app.schemas import (
     UserCreate,
     UserPublic,
 )
-from app.services import platonus_service
+from app.services import platonus_credentials_service, platonus_service
 
 SYSTEM_ADMIN_ROLE_NAME = settings.system_admin_role
 SYSTEM_ADMIN_ROLE_DESCRIPTION = "Администратор системы"
@@ -81,19 +86,19 @@ def user_public_from_model(user: User) -> UserPublic:
 
 
 def issue_tokens(db: Session, user_id: int) -> TokenPair:
-    user = db.get(User, user_id)
+    user = db.execute(
+        select(User)
+        .where(User.id == user_id)
+        .options(selectinload(User.roles).selectinload(Role.permissions))
+    ).scalar_one_or_none()
     roles, permissions = collect_roles_permissions(user)
     access_token, access_expires_at = create_access_token(
         user_id, roles=roles, permissions=permissions
     )
     refresh_token, jti, refresh_expires_at = create_refresh_token(user_id)
 
-    db_token = RefreshToken(
-        user_id=user_id,
-        jti=jti,
-        expires_at=refresh_expires_at,
-    )
-    db.add(db_token)
+    # Commits whatever the caller changed (e.g. a revoked token) along with it.
+    token_repo.add(db, user_id, jti, refresh_expires_at)
     db.commit()
 
     return TokenPair(
@@ -135,12 +140,21 @@ def register_user(payload: UserCreate, db: Session) -> UserPublic:
 
 def login_user(payload: LoginRequest, db: Session) -> TokenPair:
     user = db.execute(select(User).where(User.email == payload.email)).scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.password_hash):
+    # Bulk-created users have no password until one is set.
+    if not user or not user.password_hash:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_credentials")
+
+    valid, new_hash = verify_password_and_update(payload.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_credentials")
 
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="user_inactive")
 
+    if new_hash:
+        # Stored with an older bcrypt cost; committed together with the new refresh token.
+        user.password_hash = new_hash
+
     return issue_tokens(db, user.id)
 
 
@@ -318,12 +332,35 @@ def _generate_unique_email(*, base: str, db: Session) -> str:
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="email_conflict")
 
 
-def login_platonus_user(payload: PlatonusLoginRequest, db: Session) -> TokenPair:
+async def login_platonus_user(payload: PlatonusLoginRequest, db: Session) -> TokenPair:
+    if platonus_credentials_service.enabled():
+        cached = await run_in_threadpool(
+            platonus_credentials_service.lookup, payload.username, payload.password, db
+        )
+        if cached is not None:
+            return await run_in_threadpool(_login_platonus_result, cached, db, None)
+
     try:
-        result = platonus_service.authenticate(payload.username, payload.password)
+        result = await platonus_service.authenticate(payload.username, payload.password)
     except platonus_service.PlatonusAuthError as exc:
+        if platonus_credentials_service.enabled():
+            await run_in_threadpool(platonus_credentials_service.forget_username, payload.username, db)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+    except BrowserPoolBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="platonus_login_busy",
+            headers={"Retry-After": "5"},
+        ) from exc
+
+    return await run_in_threadpool(_login_platonus_result, result, db, payload.password)
 
+
+def _login_platonus_result(
+    result: platonus_service.PlatonusAuthResult,
+    db: Session,
+    verified_password: str | None,
+) -> TokenPair:
     extracted = _extract_identity_fields(result.info)
 
     user = db.execute(select(User).where(User.person_id == result.person_id)).scalar_one_or_none()
@@ -364,6 +401,7 @@ def login_platonus_user(payload: PlatonusLoginRequest, db: Session) -> TokenPair
         if extracted.get("last_name"):
             user.last_name = extracted["last_name"]
         db.commit()
+        user_cache.invalidate(user.id)
 
     profile = db.execute(select(PlatonusProfile).where(PlatonusProfile.user_id == user.id)).scalar_one_or_none()
     if not profile:
@@ -382,6 +420,8 @@ def login_platonus_user(payload: PlatonusLoginRequest, db: Session) -> TokenPair
         profile.primary_role = result.primary_role
         profile.roles = result.roles
         profile.info = result.info
+    if verified_password is not None:
+        platonus_credentials_service.remember(profile, verified_password)
     db.commit()
 
     return issue_tokens(db, user.id)
@@ -401,23 +441,42 @@ def refresh_tokens(payload: RefreshRequest, db: Session) -> TokenPair:
     if not user_id or not jti:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_token")
 
-    db_token = db.execute(
-        select(RefreshToken).where(
-            RefreshToken.jti == jti,
-            RefreshToken.user_id == int(user_id),
-        )
-    ).scalar_one_or_none()
-
-    now = datetime.now(timezone.utc)
-    if not db_token or db_token.revoked or db_token.expires_at <= now:
+    # Revocation and the new token commit together; a concurrent refresh
+    # with the same token finds it already revoked.
+    if not token_repo.revoke_active(db, jti, int(user_id), datetime.now(timezone.utc)):
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="refresh_expired")
 
-    db_token.revoked = True
-    db.commit()
-
     return issue_tokens(db, int(user_id))
 
 
+def purge_refresh_tokens() -> int:
+    """Delete expired and long-revoked refresh tokens in bounded batches.
+
+    On a partitioned table whole expired months are dropped first and
+    partitions for the coming months are created.
+    """
+    now = datetime.now(timezone.utc)
+    retention = timedelta(hours=settings.refresh_token_revoked_retention_hours)
+    db = SessionLocal()
+    try:
+        if token_repo.is_partitioned(db):
+            token_repo.ensure_partitions(
+                db, until=now + timedelta(days=settings.refresh_token_expires_days + 31), now=now
+            )
+            token_repo.drop_expired_partitions(db, now)
+        deleted = 0
+        while True:
+            batch = token_repo.purge_batch(db, now, retention, settings.refresh_token_purge_batch_size)
+            deleted += batch
+            if batch < settings.refresh_token_purge_batch_size:
+                return deleted
+            # Short pause between batches so purging never hogs the database.
+            time.sleep(settings.refresh_token_purge_pause_seconds)
+    finally:
+        db.close()
+
+
 def logout_user(payload: LogoutRequest, db: Session) -> dict:
     try:
         token_payload = decode_token(payload.refresh_token)
@@ -431,9 +490,7 @@ def logout_user(payload: LogoutRequest, db: Session) -> dict:
     if not jti:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_token")
 
-    db_token = db.execute(select(RefreshToken).where(RefreshToken.jti == jti)).scalar_one_or_none()
-    if db_token and not db_token.revoked:
-        db_token.revoked = True
-        db.commit()
+    token_repo.revoke(db, jti, datetime.now(timezone.utc))
+    db.commit()
 
     return {"status": "ok"}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.hashing import PasswordHashingBusy
+from app.core.security import get_password_hash, verify_password
+from app.models import PlatonusProfile
+from app.services.platonus_service import PlatonusAuthResult
+
+
+def enabled() -> bool:
+    return settings.platonus_credential_cache_ttl_seconds > 0
+
+
+def _fresh_since() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.platonus_credential_cache_ttl_seconds)
+
+
+def lookup(username: str, password: str, db: Session) -> PlatonusAuthResult | None:
+    """Return the stored identity if Platonus accepted this password recently.
+
+    The password is checked against a bcrypt hash of the last one Platonus
+    accepted for `username`; anything else means a full browser login.
+    """
+    if not enabled():
+        return None
+    profile = db.execute(
+        select(PlatonusProfile)
+        .where(
+            PlatonusProfile.username == username,
+            PlatonusProfile.credential_hash.is_not(None),
+            PlatonusProfile.credential_verified_at > _fresh_since(),
+        )
+        .order_by(PlatonusProfile.credential_verified_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if profile is None:
+        return None
+    try:
+        if not verify_password(password, profile.credential_hash):
+            return None
+    except PasswordHashingBusy:
+        # The cache is only a shortcut; log in through the browser instead.
+        return None
+    return PlatonusAuthResult(
+        username=profile.username,
+        person_id=profile.person_id,
+        primary_role=profile.primary_role,
+        roles=list(profile.roles or []),
+        info=dict(profile.info or {}),
+    )
+
+
+def remember(profile: PlatonusProfile, password: str) -> None:
+    """Record a password Platonus just accepted; the caller commits."""
+    if not enabled():
+        return
+    try:
+        profile.credential_hash = get_password_hash(password)
+    except (ValueError, PasswordHashingBusy):
+        # Longer than bcrypt accepts, or no hashing capacity right now: the
+        # login goes ahead uncached.
+        profile.credential_hash = None
+        profile.credential_verified_at = None
+        return
+    profile.credential_verified_at = datetime.now(timezone.utc)
+
+
+def forget_username(username: str, db: Session) -> None:
+    """Drop cached passwords for a username Platonus has just rejected."""
+    _clear(db, PlatonusProfile.username == username)
+
+
+def forget_user(user_id: int, db: Session) -> dict:
+    _clear(db, PlatonusProfile.user_id == user_id)
+    return {"status": "ok"}
+
+
+def forget_all(db: Session) -> dict:
+    _clear(db, PlatonusProfile.credential_hash.is_not(None))
+    return {"status": "ok"}
+
+
+def _clear(db: Session, condition) -> None:
+    db.execute(
+        update(PlatonusProfile)
+        .where(condition)
+        .values(credential_hash=None, credential_verified_at=None)
+    )
+    db.commit()
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.user_cache import user_cache
 from app.models import Permission, Role
 from app.schemas import (
     PermissionCreate,
@@ -57,6 +58,7 @@ def update_role(role_id: int, payload: RoleUpdate, db: Session) -> RolePublic:
         role.description = payload.description
 
     db.commit()
+    user_cache.clear()
     db.refresh(role)
     return RolePublic.model_validate(role)
 
@@ -77,6 +79,7 @@ def delete_role(role_id: int, db: Session) -> dict:
     db.commit()
     db.delete(role)
     db.commit()
+    user_cache.clear()
     return {"status": "ok"}
 
 
@@ -112,6 +115,7 @@ def update_permission(permission_id: int, payload: PermissionUpdate, db: Session
         permission.description = payload.description
 
     db.commit()
+    user_cache.clear()
     db.refresh(permission)
     return PermissionPublic.model_validate(permission)
 
@@ -125,6 +129,7 @@ def delete_permission(permission_id: int, db: Session) -> dict:
     db.commit()
     db.delete(permission)
     db.commit()
+    user_cache.clear()
     return {"status": "ok"}
 
 
@@ -151,5 +156,6 @@ def update_role_permissions(
 
     role.permissions = permissions
     db.commit()
+    user_cache.clear()
     db.refresh(role)
     return RolePublic.model_validate(role)
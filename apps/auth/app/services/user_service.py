@@ -1,14 +1,29 @@
 from __future__ import annotations
 
 from fastapi import HTTPException, status
-from sqlalchemy import or_, select
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash
-from app.models import Role, User
-from app.schemas import AdminUserCreate, AdminUserUpdate, UserLookupPublic, UserPublic, UserRolesUpdate
+from app.core.user_cache import user_cache
+from app.models import Role, User, user_roles
+from app.repositories import user_repo
+from app.schemas import (
+    AdminUserBulkCreate,
+    AdminUserBulkResult,
+    AdminUserCreate,
+    AdminUserUpdate,
+    UserEmailLookupResult,
+    UserLookupPublic,
+    UserPublic,
+    UserRolesUpdate,
+)
 from app.services.auth_service import user_public_from_model
 
+_email_adapter = TypeAdapter(EmailStr)
+
 
 def update_user_roles(user_id: int, payload: UserRolesUpdate, db: Session) -> UserPublic:
     user = db.get(User, user_id)
@@ -24,6 +39,7 @@ def update_user_roles(user_id: int, payload: UserRolesUpdate, db: Session) -> Us
 
     user.roles = roles
     db.commit()
+    user_cache.invalidate(user_id)
     db.refresh(user)
     return user_public_from_model(user)
 
@@ -44,35 +60,42 @@ def lookup_users(user_ids: list[int], db: Session) -> list[UserLookupPublic]:
     return [UserLookupPublic.model_validate(by_id[user_id]) for user_id in ids if user_id in by_id]
 
 
-def search_users(*, q: str | None, limit: int, offset: int, db: Session) -> list[UserLookupPublic]:
-    stmt = select(User).where(User.is_active.is_(True))
+def lookup_users_by_email(emails: list[str], db: Session) -> UserEmailLookupResult:
+    """Map emails to user ids in one query, case-insensitively."""
+    wanted = {email.strip().lower() for email in emails if email and email.strip()}
+    if not wanted:
+        return UserEmailLookupResult()
 
-    if q is not None and q.strip():
-        query = q.strip()
-        if query.isdigit():
-            stmt = stmt.where(
-                or_(
-                    User.id == int(query),
-                    User.iin == query,
-                    User.person_id == query,
-                )
-            )
-        else:
-            like = f"%{query}%"
-            stmt = stmt.where(
-                or_(
-                    User.full_name.ilike(like),
-                    User.email.ilike(like),
-                    User.first_name.ilike(like),
-                    User.last_name.ilike(like),
-                    User.iin.ilike(like),
-                    User.person_id.ilike(like),
-                )
-            )
+    rows = db.execute(
+        select(func.lower(User.email), User.id).where(func.lower(User.email).in_(wanted))
+    ).all()
+    found = {email: user_id for email, user_id in rows}
+    return UserEmailLookupResult(users=found, missing=sorted(wanted - found.keys()))
+
+
+def search_users(
+    *, q: str | None, limit: int, offset: int, cursor: str | None = None, db: Session
+) -> tuple[list[UserLookupPublic], str | None]:
+    """Relevance-ranked search; returns the page and the cursor for the next one.
+
+    With `cursor` the page starts after the previous one and `offset` is
+    ignored, so deep pages cost the same as the first.
+    """
+    after = None
+    if cursor:
+        try:
+            score, _, user_id = cursor.partition(":")
+            after = (int(score), int(user_id))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_cursor")
+        offset = 0
 
-    stmt = stmt.order_by(User.created_at.desc()).limit(limit).offset(offset)
-    users = db.execute(stmt).scalars().all()
-    return [UserLookupPublic.model_validate(user) for user in users]
+    rows = user_repo.search(db, q, limit=limit, offset=offset, after=after)
+    next_cursor = None
+    if len(rows) == limit:
+        last_user, last_score = rows[-1]
+        next_cursor = f"{last_score}:{last_user.id}"
+    return [UserLookupPublic.model_validate(user) for user, _ in rows], next_cursor
 
 
 def get_user(user_id: int, db: Session) -> UserPublic:
@@ -119,6 +142,69 @@ def create_user(payload: AdminUserCreate, db: Session) -> UserPublic:
     return user_public_from_model(user)
 
 
+def bulk_create_users(payload: AdminUserBulkCreate, db: Session) -> AdminUserBulkResult:
+    """Create the users whose email is not registered yet, all in one transaction.
+
+    Bulk-created users get no password: they sign in through Platonus or
+    after an admin sets one, so no bcrypt runs on this request.
+    """
+    items = {}
+    invalid = []
+    for item in payload.users:
+        try:
+            address = _email_adapter.validate_python(item.email.strip())
+        except ValidationError:
+            invalid.append(item.email)
+            continue
+        items.setdefault(address.lower(), item.model_copy(update={"email": address}))
+    existing = lookup_users_by_email(list(items), db).users
+
+    role_ids = set(payload.role_ids)
+    if role_ids:
+        found = db.execute(select(Role.id).where(Role.id.in_(role_ids))).scalars().all()
+        if len(found) != len(role_ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="role_not_found")
+
+    rows = [
+        {
+            "email": item.email,
+            "password_hash": "",
+            "full_name": item.full_name,
+            "first_name": item.first_name,
+            "last_name": item.last_name,
+            "department_id": item.department_id,
+            "role": item.role,
+            "iin": item.iin,
+            "person_id": item.person_id,
+            "is_active": item.is_active,
+        }
+        for email, item in items.items()
+        if email not in existing
+    ]
+    created = {}
+    try:
+        if rows:
+            # Multi-row INSERT ... RETURNING instead of one statement per user.
+            inserted = db.execute(insert(User).returning(User.id, User.email), rows).all()
+            created = {email.lower(): user_id for user_id, email in inserted}
+            if role_ids:
+                db.execute(
+                    insert(user_roles),
+                    [
+                        {"user_id": user_id, "role_id": role_id}
+                        for user_id in created.values()
+                        for role_id in role_ids
+                    ],
+                )
+        db.commit()
+    except IntegrityError:
+        # Another request registered one of the emails meanwhile.
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="email_already_registered")
+
+    return AdminUserBulkResult(created=created, existing=existing, invalid=invalid)
+
+
 def update_user(user_id: int, payload: AdminUserUpdate, db: Session) -> UserPublic:
     user = db.get(User, user_id)
     if not user:
@@ -166,6 +252,7 @@ def update_user(user_id: int, payload: AdminUserUpdate, db: Session) -> UserPubl
             user.roles = []
 
     db.commit()
+    user_cache.invalidate(user_id)
     db.refresh(user)
     return user_public_from_model(user)
 
@@ -179,4 +266,5 @@ def delete_user(user_id: int, db: Session) -> dict:
     db.commit()
     db.delete(user)
     db.commit()
+    user_cache.invalidate(user_id)
     return {"status": "ok"}
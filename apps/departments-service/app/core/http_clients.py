@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.tracing import async_http_client, http_client
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ServiceClients:
+    """Keep-alive clients for outgoing calls, one sync and one async per target.
+
+    Clients are created on first use, so a service only holds pools for the
+    services it actually calls, and are closed on application shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sync: dict[str, httpx.Client] = {}
+        self._async: dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _options() -> dict[str, Any]:
+        return {
+            "timeout": settings.http_client_timeout_seconds,
+            "limits": httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive_connections,
+                keepalive_expiry=settings.http_client_keepalive_expiry,
+            ),
+        }
+
+    def sync_for(self, url: str) -> httpx.Client:
+        origin = _origin(url)
+        client = self._sync.get(origin)
+        if client is None:
+            # Sync endpoints run on worker threads.
+            with self._lock:
+                client = self._sync.get(origin)
+                if client is None:
+                    client = http_client(**self._options())
+                    self._sync[origin] = client
+        return client
+
+    def async_for(self, url: str) -> httpx.AsyncClient:
+        origin = _origin(url)
+        client = self._async.get(origin)
+        if client is None:
+            client = async_http_client(**self._options())
+            self._async[origin] = client
+        return client
+
+    async def aclose(self) -> None:
+        with self._lock:
+            sync_clients = list(self._sync.values())
+            async_clients = list(self._async.values())
+            self._sync.clear()
+            self._async.clear()
+        for client in sync_clients:
+            client.close()
+        for client in async_clients:
+            await client.aclose()
+
+
+service_clients = ServiceClients()
+
+
+class ServiceClient:
+    """Sends each request through the shared client for its target.
+
+    Usable as a context manager in place of a throwaway `httpx.Client`;
+    nothing is closed on exit, the connections go back to the pool.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+
+    def __enter__(self) -> "ServiceClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return service_clients.sync_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("DELETE", url, **kwargs)
+
+
+class AsyncServiceClient:
+    """Async counterpart of `ServiceClient`."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+
+    async def __aenter__(self) -> "AsyncServiceClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return await service_clients.async_for(url).request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
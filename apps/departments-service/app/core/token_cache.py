@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import copy
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core.identity import token_fingerprint
+
+# None means auth answered that the token is not valid.
+Introspect = Callable[[str], Awaitable["dict[str, Any] | None"]]
+
+
+@dataclass
+class _Entry:
+    user: dict[str, Any] | None
+    expires_at: float
+
+
+def _token_exp(token: str) -> float | None:
+    """Read `exp` from the JWT payload without verifying it.
+
+    Only used to stop caching a token past its own expiry; auth has already
+    verified the signature by the time an entry is stored.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class TokenCache:
+    """LRU of `/auth/me` answers keyed by token fingerprint.
+
+    Valid users are kept for `ttl` seconds (never past the token's `exp`),
+    rejected tokens for `negative_ttl`. Concurrent misses for the same token
+    share one call to auth.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._fetch_seconds = 0.0
+        self._fetches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    async def get_user(self, token: str, introspect: Introspect) -> dict[str, Any] | None:
+        if not self.enabled:
+            return await introspect(token)
+
+        key = token_fingerprint(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                if entry.user is None:
+                    self.negative_hits += 1
+                    return None
+                self.hits += 1
+                return copy.deepcopy(entry.user)
+            del self._entries[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            pending = asyncio.ensure_future(self._fetch(key, token, introspect))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not cancel the call others await.
+        user = await asyncio.shield(pending)
+        return copy.deepcopy(user)
+
+    async def _fetch(self, key: str, token: str, introspect: Introspect) -> dict[str, Any] | None:
+        started = time.monotonic()
+        try:
+            user = await introspect(token)
+        except BaseException:
+            self.errors += 1
+            raise
+        self._fetch_seconds += time.monotonic() - started
+        self._fetches += 1
+        self._store(key, token, user)
+        return user
+
+    def _store(self, key: str, token: str, user: dict[str, Any] | None) -> None:
+        now = time.monotonic()
+        ttl = self.ttl if user is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        exp = _token_exp(token)
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+            if ttl <= 0:
+                return
+        self._entries[key] = _Entry(user=user, expires_at=now + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+        avg_fetch = self._fetch_seconds / self._fetches if self._fetches else 0.0
+        saved = self.hits + self.negative_hits + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_ratio": round(saved / lookups, 4) if lookups else 0.0,
+            "avg_auth_ms": round(avg_fetch * 1000, 2),
+            # Calls to auth avoided, priced at the average observed auth latency.
+            "saved_ms": round(saved * avg_fetch * 1000, 1),
+        }
+
+
+token_cache = TokenCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl=settings.token_cache_ttl_seconds,
+    negative_ttl=settings.token_cache_negative_ttl_seconds,
+)
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
 from fastapi import HTTPException, status
 
 from app.core.config import settings
+from app.core.http_clients import AsyncServiceClient
 from app.schemas.department import DepartmentUserPublic
 
 
@@ -37,7 +37,7 @@ async def unassign_user_from_department(
 
 
 async def _fetch_users(token: str) -> list[dict[str, Any]]:
-    async with httpx.AsyncClient(timeout=10) as client:
+    async with AsyncServiceClient(timeout=10) as client:
         response = await client.get(
             f"{settings.auth_service_url}/admin/users",
             headers={"Authorization": f"Bearer {token}"},
@@ -57,7 +57,7 @@ async def _fetch_users(token: str) -> list[dict[str, Any]]:
 async def _update_user(
     user_id: int, payload: dict[str, Any], token: str
 ) -> dict[str, Any]:
-    async with httpx.AsyncClient(timeout=10) as client:
+    async with AsyncServiceClient(timeout=10) as client:
         response = await client.put(
             f"{settings.auth_service_url}/admin/users/{user_id}",
             json=payload,
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from urllib.parse import urlencode
 
-import httpx
 from fastapi import HTTPException, status
 
+from app.core.http_clients import ServiceClient
+
 
 def lookup_users(*, token: str, auth_service_url: str, ids: list[int]) -> list[dict]:
     unique_ids = []
@@ -24,7 +25,7 @@ def lookup_users(*, token: str, auth_service_url: str, ids: list[int]) -> list[d
     qs = urlencode([("ids", str(i)) for i in unique_ids])
     url = f"{auth_service_url}/auth/users/lookup?{qs}"
     try:
-        with httpx.Client(timeout=10) as client:
+        with ServiceClient(timeout=10) as client:
             response = client.get(url, headers={"Authorization": f"Bearer {token}"})
     except Exception:
         raise HTTPException(
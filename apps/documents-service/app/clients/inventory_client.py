@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import httpx
 from fastapi import HTTPException, status
 
+from app.core.http_clients import ServiceClient
+
 
 def get_inventory_item(*, inventory_service_url: str, item_id: int) -> dict:
     try:
-        with httpx.Client(timeout=5) as client:
+        with ServiceClient(timeout=5) as client:
             response = client.get(f"{inventory_service_url}/items/{item_id}")
     except Exception:
         raise HTTPException(
@@ -26,7 +27,7 @@ def get_inventory_item(*, inventory_service_url: str, item_id: int) -> dict:
 
 def list_items_by_room(*, token: str, inventory_service_url: str, room_id: int) -> list[dict]:
     try:
-        with httpx.Client(timeout=10) as client:
+        with ServiceClient(timeout=10) as client:
             response = client.get(
                 f"{inventory_service_url}/items/room/{room_id}",
                 headers={"Authorization": f"Bearer {token}"},
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "X-Request-ID"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+_STARTED_KEY = "tracing_started"
+_NON_TOKEN = re.compile(r"[^A-Za-z0-9.-]")
+
+# Timings are a mutable dict held in a context variable: sync endpoints and
+# dependencies run on worker threads with a copy of the context, and still
+# write into the same dict as the request that spawned them.
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_timings: ContextVar[Optional[Dict[str, Tuple[float, int]]]] = ContextVar(
+    "timings", default=None
+)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def record(name: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is None:
+        return
+    total, count = timings.get(name, (0.0, 0))
+    timings[name] = (total + seconds, count + 1)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def server_timing(timings: Dict[str, Tuple[float, int]], total: float) -> str:
+    entries = []
+    accounted = 0.0
+    for name, (seconds, count) in timings.items():
+        accounted += seconds
+        entries.append(f'{name};dur={seconds * 1000:.1f};desc="{count}x"')
+    # Whatever is not DB, outgoing HTTP or explicit rendering: handler code
+    # and response serialization. Concurrent calls can overlap, hence the floor.
+    entries.append(f"app;dur={max(0.0, total - accounted) * 1000:.1f}")
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class TracingMiddleware:
+    """Adopt or mint `X-Request-ID` and report where the request spent its time."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = MutableHeaders(scope=scope).get(REQUEST_ID_HEADER)
+        if not request_id or not _REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        timings: Dict[str, Tuple[float, int]] = {}
+        id_token = _request_id.set(request_id)
+        timings_token = _timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+                headers.append(
+                    SERVER_TIMING_HEADER,
+                    server_timing(timings, time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_id.reset(id_token)
+            _timings.reset(timings_token)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Add time spent in cursor execution to the current request's `db` timing."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        stack = conn.info.get(_STARTED_KEY)
+        if stack:
+            record("db", time.perf_counter() - stack.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context) -> None:
+        stack = context.connection.info.get(_STARTED_KEY) if context.connection else None
+        if stack:
+            record("db", time.perf_counter() - stack.pop())
+
+
+def _on_request(request: httpx.Request) -> None:
+    request_id = _request_id.get()
+    if request_id and REQUEST_ID_HEADER not in request.headers:
+        request.headers[REQUEST_ID_HEADER] = request_id
+    request.extensions[_STARTED_KEY] = time.perf_counter()
+
+
+def _on_response(response: httpx.Response) -> None:
+    started = response.request.extensions.get(_STARTED_KEY)
+    if started is not None:
+        # Measured to response headers; bodies between services are small.
+        host = _NON_TOKEN.sub("-", response.request.url.host)
+        record(f"http-{host}", time.perf_counter() - started)
+
+
+async def _on_request_async(request: httpx.Request) -> None:
+    _on_request(request)
+
+
+async def _on_response_async(response: httpx.Response) -> None:
+    _on_response(response)
+
+
+def http_client(**kwargs) -> httpx.Client:
+    """`httpx.Client` that forwards `X-Request-ID` and records call timings."""
+    return httpx.Client(
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+        **kwargs,
+    )
+
+
+def async_http_client(**kwargs) -> httpx.AsyncClient:
+    """`httpx.AsyncClient` that forwards `X-Request-ID` and records call timings."""
+    return httpx.AsyncClient(
+        event_hooks={"request": [_on_request_async], "response": [_on_response_async]},
+        **kwargs,
+    )
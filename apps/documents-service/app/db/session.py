@@ -7,6 +7,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.tracing import instrument_engine
 
 connect_args: dict = {}
 if settings.database_url.startswith("sqlite"):
@@ -17,5 +18,6 @@ if settings.database_url.startswith("sqlite"):
         Path(os.path.dirname(sqlite_path)).mkdir(parents=True, exist_ok=True)
 
 engine = create_engine(settings.database_url, connect_args=connect_args)
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.clients import get_inventory_item, get_room, list_items_by_room, lookup_users
 from app.core.config import settings
+from app.core.tracing import timed
 from app.models.document import GeneratedDocument
 from app.models.enums import DocumentStatus, DocumentTargetType, DocumentTypeCode
 from app.renderers.docx_renderer import render_docx
@@ -518,13 +519,15 @@ def generate_document(
 
     _apply_document_metadata(doc, context=context, target_type=target_type, target_id=target_id)
 
-    docx_bytes = render_docx(template_docx=template.docx_blob, context=context)
+    with timed("render"):
+        docx_bytes = render_docx(template_docx=template.docx_blob, context=context)
     doc.docx_blob = docx_bytes
 
     if include_pdf:
-        doc.pdf_blob = convert_docx_to_pdf_bytes(
-            docx_bytes=docx_bytes, soffice_bin=settings.libreoffice_bin
-        )
+        with timed("pdf"):
+            doc.pdf_blob = convert_docx_to_pdf_bytes(
+                docx_bytes=docx_bytes, soffice_bin=settings.libreoffice_bin
+            )
 
     db.add(doc)
     db.commit()
@@ -714,13 +717,15 @@ def generate_document_batch(
 
     _apply_document_metadata(doc, context=context, target_type=target_type, target_id=target_ids[0])
 
-    docx_bytes = render_docx(template_docx=template.docx_blob, context=context)
+    with timed("render"):
+        docx_bytes = render_docx(template_docx=template.docx_blob, context=context)
     doc.docx_blob = docx_bytes
 
     if include_pdf:
-        doc.pdf_blob = convert_docx_to_pdf_bytes(
-            docx_bytes=docx_bytes, soffice_bin=settings.libreoffice_bin
-        )
+        with timed("pdf"):
+            doc.pdf_blob = convert_docx_to_pdf_bytes(
+                docx_bytes=docx_bytes, soffice_bin=settings.libreoffice_bin
+            )
 
     db.add(doc)
     db.commit()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import AdmissionRule
+
+
+@dataclass
+class AdmissionLimiter:
+    """Concurrency cap with a short, bounded waiting queue.
+
+    Up to `rule.concurrency` requests run at once and up to `rule.queue_size`
+    more wait at most `rule.queue_timeout` seconds for a slot. Anything beyond
+    that is turned away with 429 and a Retry-After estimated from recent
+    hold times, instead of piling onto an already saturated service.
+    """
+
+    rule: AdmissionRule
+    active: int = 0
+    waiting: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    max_waiting: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    avg_hold_seconds: float = 1.0
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.rule.concurrency)
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.rule.methods and method not in self.rule.methods:
+            return False
+        return fnmatchcase("/" + path.lstrip("/"), self.rule.pattern)
+
+    def _too_many(self) -> HTTPException:
+        slots_ahead = self.waiting + 1
+        retry_after = math.ceil(self.avg_hold_seconds * slots_ahead / self.rule.concurrency)
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="too_many_requests",
+            headers={"Retry-After": str(max(1, retry_after))},
+        )
+
+    async def acquire(self) -> Callable[[], None]:
+        if not self._semaphore.locked():
+            # Free slot: taken synchronously, no queueing.
+            await self._semaphore.acquire()
+        else:
+            await self._wait_in_queue()
+        self.admitted += 1
+        self.active += 1
+        started = time.monotonic()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self.active -= 1
+            held = time.monotonic() - started
+            self.avg_hold_seconds = 0.8 * self.avg_hold_seconds + 0.2 * held
+            self._semaphore.release()
+
+        return release
+
+    async def _wait_in_queue(self) -> None:
+        if self.waiting >= self.rule.queue_size:
+            self.rejected += 1
+            raise self._too_many()
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.rule.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise self._too_many()
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - queued_at
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> dict:
+        return {
+            "pattern": self.rule.pattern,
+            "methods": list(self.rule.methods),
+            "concurrency": self.rule.concurrency,
+            "queue_size": self.rule.queue_size,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self.total_wait_seconds / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+
+def find_limiter(limiters: list[AdmissionLimiter], method: str, path: str) -> Optional[AdmissionLimiter]:
+    for limiter in limiters:
+        if limiter.matches(method, path):
+            return limiter
+    return None
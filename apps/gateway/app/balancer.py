@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+LEAST_OUTSTANDING = "least_outstanding"
+POWER_OF_TWO = "p2c"
+
+
+@dataclass
+class Replica:
+    url: str
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+@dataclass
+class Balancer:
+    """Pick an upstream replica for each request.
+
+    `least_outstanding` sends the request to the replica with the fewest
+    requests in flight; `p2c` compares two random replicas, which avoids
+    herding when many gateways share stale counts. Failures are detected
+    passively: a replica that fails `failure_threshold` times in a row is
+    left out for `ejection_seconds`. If every replica is ejected, all of
+    them are considered again rather than failing outright.
+    """
+
+    replicas: List[Replica]
+    strategy: str = LEAST_OUTSTANDING
+    failure_threshold: int = 3
+    ejection_seconds: float = 10.0
+    _random: random.Random = field(default_factory=random.Random, repr=False)
+
+    @classmethod
+    def for_urls(cls, urls: Sequence[str], **kwargs) -> "Balancer":
+        return cls(replicas=[Replica(url=url) for url in urls], **kwargs)
+
+    def pick(self) -> Replica:
+        if len(self.replicas) == 1:
+            return self.replicas[0]
+        now = time.monotonic()
+        candidates = [r for r in self.replicas if r.available(now)] or self.replicas
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.strategy == POWER_OF_TWO:
+            first, second = self._random.sample(candidates, 2)
+            return first if first.outstanding <= second.outstanding else second
+        fewest = min(r.outstanding for r in candidates)
+        return self._random.choice([r for r in candidates if r.outstanding == fewest])
+
+    def start(self, replica: Replica) -> None:
+        replica.outstanding += 1
+        replica.requests += 1
+
+    def finish(self, replica: Replica, ok: bool) -> None:
+        replica.outstanding -= 1
+        if ok:
+            replica.failures = 0
+            return
+        replica.failures += 1
+        if replica.failures >= self.failure_threshold:
+            self.eject(replica)
+
+    def eject(self, replica: Replica) -> None:
+        replica.failures = 0
+        replica.ejections += 1
+        replica.ejected_until = time.monotonic() + self.ejection_seconds
+
+    def restore(self, replica: Replica) -> None:
+        replica.failures = 0
+        replica.ejected_until = 0.0
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "replicas": [
+                {
+                    "url": r.url,
+                    "outstanding": r.outstanding,
+                    "requests": r.requests,
+                    "ejections": r.ejections,
+                    "available": r.available(now),
+                }
+                for r in self.replicas
+            ],
+        }
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.dispatch import ProxyHandler, RouteTable, gateway_error
+
+# Headers of the outer request that must not leak into sub-requests.
+_DROPPED_HEADERS = {"content-length", "content-type", "accept-encoding", "transfer-encoding"}
+
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+    timeout: Optional[float] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+
+def _sub_scope(request: Request, item: BatchItem, body: bytes) -> dict:
+    path, _, query = item.path.partition("?")
+    if not path.startswith("/"):
+        path = "/" + path
+
+    headers = {
+        key.decode("latin-1"): value.decode("latin-1")
+        for key, value in request.scope["headers"]
+        if key.decode("latin-1").lower() not in _DROPPED_HEADERS
+    }
+    for key, value in item.headers.items():
+        headers[key.lower()] = value
+    if body:
+        headers["content-length"] = str(len(body))
+        headers.setdefault("content-type", "application/json")
+
+    return {
+        **request.scope,
+        "method": item.method.upper(),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+    }
+
+
+def _encode_body(item: BatchItem) -> bytes:
+    if item.body is None:
+        return b""
+    if isinstance(item.body, str):
+        return item.body.encode("utf-8")
+    return json.dumps(item.body).encode("utf-8")
+
+
+async def _collect(response: Response) -> bytes:
+    try:
+        if isinstance(response, StreamingResponse):
+            chunks = []
+            async for chunk in response.body_iterator:
+                chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+            return b"".join(chunks)
+        return bytes(response.body)
+    finally:
+        if response.background is not None:
+            await response.background()
+
+
+def _decode_body(content_type: str, body: bytes) -> dict:
+    if not body:
+        return {"body": None}
+    if "json" in content_type:
+        try:
+            return {"body": json.loads(body)}
+        except ValueError:
+            pass
+    if content_type.startswith("text/") or "json" in content_type:
+        return {"body": body.decode("utf-8", errors="replace")}
+    return {"body": base64.b64encode(body).decode("ascii"), "body_encoding": "base64"}
+
+
+async def run_batch(
+    request: Request,
+    payload: BatchRequest,
+    table: RouteTable,
+    handler: ProxyHandler,
+    default_timeout: float,
+    max_requests: int,
+) -> dict:
+    if len(payload.requests) > max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="too_many_subrequests",
+        )
+
+    async def run_one(index: int, item: BatchItem) -> dict:
+        result: dict = {"id": item.id if item.id is not None else str(index)}
+        body = _encode_body(item)
+        scope = _sub_scope(request, item, body)
+        match = table.match(scope["path"])
+        if match is None:
+            result.update(status=404, headers={}, body={"detail": "route_not_found"})
+            return result
+
+        sent = False
+
+        async def receive() -> dict:
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        pool, upstream_path = match
+
+        async def call() -> tuple[Response, bytes]:
+            try:
+                response = await handler(pool, Request(scope, receive), upstream_path)
+            except Exception as exc:
+                response = gateway_error(exc)
+            return response, await _collect(response)
+
+        try:
+            response, content = await asyncio.wait_for(call(), timeout=item.timeout or default_timeout)
+        except asyncio.TimeoutError:
+            result.update(status=504, headers={}, body={"detail": "subrequest_timeout"})
+            return result
+
+        headers = dict(response.headers)
+        headers.pop("content-length", None)
+        result.update(status=response.status_code, headers=headers)
+        result.update(_decode_body(headers.get("content-type", ""), content))
+        return result
+
+    responses = await asyncio.gather(
+        *(run_one(index, item) for index, item in enumerate(payload.requests))
+    )
+    return {"responses": list(responses)}
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import HTTPException, status
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_STATUSES = {502, 503, 504}
+
+
+def health_url(upstream: str) -> str:
+    parts = urlsplit(upstream)
+    return f"{parts.scheme}://{parts.netloc}/health"
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure breaker for one route and all of its replicas.
+
+    After `failure_threshold` failures in a row the circuit opens and requests
+    fail fast with 503. Once `reset_seconds` have passed, the next request
+    probes `/health` on every candidate replica at once; if any answers, the
+    circuit half-opens and lets traffic through, and the first successful
+    response closes it.
+    """
+
+    health_urls: List[str]
+    failure_threshold: int
+    reset_seconds: float
+    state: str = CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    rejected: int = 0
+    probes: int = 0
+    _probe_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def _retry_after(self) -> int:
+        remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+        return max(1, int(remaining + 0.999))
+
+    def _reject(self) -> HTTPException:
+        self.rejected += 1
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="upstream_unavailable",
+            headers={"Retry-After": str(self._retry_after())},
+        )
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    async def before_request(
+        self, client: httpx.AsyncClient, health_urls: Optional[Sequence[str]] = None
+    ) -> Optional[Set[str]]:
+        """Reject while open; returns the healthy URLs when this call probed.
+
+        `health_urls` narrows the probe to the replicas worth trying (the
+        balancer's non-ejected ones); by default all of them are probed.
+        """
+        if self.state != OPEN:
+            return None
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            raise self._reject()
+
+        async with self._probe_lock:
+            # Another request may have finished the probe while we waited.
+            if self.state != OPEN:
+                return None
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                raise self._reject()
+            self.probes += 1
+            urls = list(health_urls or self.health_urls)
+            results = await asyncio.gather(*(self._probe(client, url) for url in urls))
+            healthy = {url for url, ok in zip(urls, results) if ok}
+            if healthy:
+                self.state = HALF_OPEN
+                return healthy
+            self._open()
+            raise self._reject()
+
+    async def _probe(self, client: httpx.AsyncClient, url: str) -> bool:
+        try:
+            response = await client.get(url, timeout=client.timeout.connect)
+        except httpx.HTTPError:
+            return False
+        return response.status_code < 500
+
+    def record(self, status_code: Optional[int]) -> None:
+        """Record an outcome; None means the upstream could not be reached."""
+        if status_code is None or status_code in FAILURE_STATUSES:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+            return
+        self.failures = 0
+        self.state = CLOSED
+
+    def snapshot(self) -> dict:
+        data = {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "probes": self.probes,
+            "health_urls": self.health_urls,
+        }
+        if self.state == OPEN:
+            data["retry_after"] = self._retry_after()
+        return data
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+CacheKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    cache_control: str = ""
+    expires_at: float = 0.0
+
+    @property
+    def storable(self) -> bool:
+        return self.status_code == 200 and "no-store" not in self.cache_control.lower()
+
+    def with_ttl(self, ttl: float) -> "CachedResponse":
+        # Server-Timing describes the original fetch, not later cache hits.
+        headers = {
+            key: value for key, value in self.headers.items()
+            if key.lower() != "server-timing"
+        }
+        return replace(self, headers=headers, expires_at=time.monotonic() + ttl)
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, status_code=self.status_code, headers=self.headers)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def principal_of(request: Request) -> str:
+    authorization = request.headers.get("authorization", "")
+    if not authorization:
+        return "anonymous"
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:32]
+
+
+def cache_key(route_name: str, request: Request) -> CacheKey:
+    url = request.url.path
+    if request.url.query:
+        url = f"{url}?{request.url.query}"
+    return (
+        route_name,
+        url,
+        principal_of(request),
+        request.headers.get("accept-encoding", ""),
+    )
+
+
+@dataclass
+class ResponseCache:
+    """In-process TTL + LRU cache for small upstream GET responses.
+
+    Entries are grouped by route name so that any write through the same
+    route prefix can drop everything cached for it at once.
+    """
+
+    max_entries: int
+    max_body_bytes: int
+    _entries: "OrderedDict[CacheKey, CachedResponse]" = field(default_factory=OrderedDict)
+    stats: Dict[str, CacheStats] = field(default_factory=dict)
+
+    def _stats(self, route_name: str) -> CacheStats:
+        return self.stats.setdefault(route_name, CacheStats())
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        stats = self._stats(key[0])
+        entry = self._entries.get(key)
+        if entry is None:
+            stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        stats.hits += 1
+        return entry
+
+    def set(self, key: CacheKey, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_body_bytes:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._stats(key[0]).stores += 1
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._stats(evicted[0]).evictions += 1
+
+    def invalidate(self, route_name: str) -> None:
+        stale = [key for key in self._entries if key[0] == route_name]
+        for key in stale:
+            del self._entries[key]
+        self._stats(route_name).invalidations += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "routes": {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    result: Optional[T] = None
+    error: Optional[BaseException] = None
+    waiters: int = 0
+
+
+@dataclass
+class FlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+    fallbacks: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "fallbacks": self.fallbacks,
+        }
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller (the leader) runs `fn`; callers arriving while it is in
+    flight wait for its shared result instead of calling `fn` themselves.
+    `fn` returns `(own, shared)`: `own` is handed only to the leader and
+    `shared` to every waiter. A `shared` of None means the result could not
+    be fanned out (e.g. a streamed body) and waiters must run on their own.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self.stats: Dict[str, FlightStats] = {}
+
+    def _stats(self, group: str) -> FlightStats:
+        return self.stats.setdefault(group, FlightStats())
+
+    async def do(
+        self,
+        group: str,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Tuple[Optional[T], Optional[T]]]],
+    ) -> Tuple[Optional[T], Optional[T]]:
+        stats = self._stats(group)
+        call = self._calls.get(key)
+        if call is not None:
+            call.waiters += 1
+            await call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if call.result is None:
+                stats.fallbacks += 1
+                return await fn()
+            stats.coalesced += 1
+            return None, call.result
+
+        call = _Call()
+        self._calls[key] = call
+        stats.leaders += 1
+        try:
+            own, shared = await fn()
+            call.result = shared
+            return own, shared
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            # A cancelled leader (client went away) leaves result None, so
+            # waiters fall back to their own upstream call.
+            del self._calls[key]
+            call.done.set()
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "routes": {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, List, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync-flush so every upstream chunk reaches the client immediately.
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int) -> None:
+        self._obj = brotli.Compressor(quality=min(level, 11))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encodings() -> List[str]:
+    """Supported codings in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str, supported: Iterable[str]) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    for coding in supported:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > 0:
+            return coding
+    return None
+
+
+def _make_encoder(coding: str, level: int) -> _Encoder:
+    if coding == "zstd":
+        return _ZstdEncoder(level)
+    if coding == "br":
+        return _BrotliEncoder(level)
+    return _GzipEncoder(level)
+
+
+class CompressionMiddleware:
+    """Compress eligible responses according to the client's Accept-Encoding.
+
+    Bodies that are already encoded, below `minimum_size` (when the length is
+    known up front) or outside the content-type allowlist pass through
+    untouched, as do event streams. Streamed bodies are compressed chunk by
+    chunk and flushed after each one, so large downloads keep streaming.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        content_types: Iterable[str],
+        level: int,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(t.strip().lower() for t in content_types if t.strip())
+        self.level = level
+        self.supported = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.supported)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        encoder: Optional[_Encoder] = None
+        started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal encoder, started
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if self._eligible(message["status"], headers):
+                    encoder = _make_encoder(coding, self.level)
+                    del headers["content-length"]
+                    headers["content-encoding"] = coding
+                    headers.add_vary_header("Accept-Encoding")
+                started = True
+                await send(message)
+                return
+
+            if message["type"] != "http.response.body" or encoder is None or not started:
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            body = encoder.compress(message.get("body", b""))
+            if not more_body:
+                body += encoder.finish()
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _eligible(self, status_code: int, headers: MutableHeaders) -> bool:
+        if status_code < 200 or status_code in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        if not content_type or not content_type.startswith(self.content_types):
+            return False
+        if content_type == "text/event-stream":
+            # Events are tiny and latency-sensitive; compression buys nothing.
+            return False
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            return int(content_length) >= self.minimum_size
+        return True
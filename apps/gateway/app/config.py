@@ -1,7 +1,16 @@
 import json
 import os
 from dataclasses import dataclass
-from typing import List
+from typing import Any, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AdmissionRule:
+    pattern: str = "*"
+    methods: Tuple[str, ...] = ()
+    concurrency: int = 1
+    queue_size: int = 0
+    queue_timeout: float = 5.0
 
 
 @dataclass(frozen=True)
@@ -9,6 +18,37 @@ class Route:
     name: str
     path: str
     upstream: str
+    cache_ttl: float = 0.0
+    cache_paths: Tuple[str, ...] = ()
+    coalesce: bool = False
+    # Upstream pool settings; None falls back to the gateway-wide defaults.
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    max_in_flight: Optional[int] = None
+    # First matching rule applies; patterns are fnmatch-style on the path
+    # below the route prefix, e.g. "/items/import/confirm*".
+    limits: Tuple[AdmissionRule, ...] = ()
+    # Extra replicas of `upstream`; when set, `upstream` is the first one.
+    replicas: Tuple[str, ...] = ()
+    balancer: str = "least_outstanding"
+
+    @property
+    def upstreams(self) -> Tuple[str, ...]:
+        return self.replicas or (self.upstream,)
+
+    def is_cacheable(self, upstream_path: str) -> bool:
+        if self.cache_ttl <= 0:
+            return False
+        if not self.cache_paths:
+            return True
+        path = "/" + upstream_path.lstrip("/")
+        return any(
+            path == prefix or path.startswith(prefix.rstrip("/") + "/")
+            for prefix in self.cache_paths
+        )
 
 
 DEFAULT_ROUTES: List[Route] = [
@@ -31,14 +71,161 @@ DEFAULT_ROUTES: List[Route] = [
 ]
 
 
+def _option(item: dict, key: str, cast: Any) -> Any:
+    value = item.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_limits(raw: Any) -> Tuple[AdmissionRule, ...]:
+    if not isinstance(raw, list):
+        return ()
+    rules: List[AdmissionRule] = []
+    for item in raw:
+        if not isinstance(item, dict):
+            continue
+        concurrency = _option(item, "concurrency", int)
+        if not concurrency or concurrency < 1:
+            continue
+        pattern = str(item.get("pattern") or "*").strip()
+        if not pattern.startswith(("/", "*")):
+            pattern = "/" + pattern
+        rules.append(
+            AdmissionRule(
+                pattern=pattern,
+                methods=tuple(str(m).upper() for m in item.get("methods") or []),
+                concurrency=concurrency,
+                queue_size=max(0, _option(item, "queue", int) or 0),
+                queue_timeout=_option(item, "queue_timeout", float) or 5.0,
+            )
+        )
+    return tuple(rules)
+
+
+def parse_routes(items: Any) -> List[Route]:
+    """Build routes from the `GATEWAY_ROUTES` JSON shape, skipping invalid entries."""
+    if not isinstance(items, list):
+        return []
+    routes: List[Route] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get("name") or item.get("path") or "route")
+        path = str(item.get("path") or "").strip()
+        raw_upstream = item.get("upstreams") or item.get("upstream") or ""
+        if isinstance(raw_upstream, list):
+            replicas = tuple(str(u).strip() for u in raw_upstream if str(u).strip())
+        else:
+            replicas = (str(raw_upstream).strip(),) if str(raw_upstream).strip() else ()
+        if not path or not replicas:
+            continue
+        upstream = replicas[0]
+        if not path.startswith("/"):
+            path = "/" + path
+        cache_ttl = _option(item, "cache_ttl", float) or 0.0
+        cache_paths = tuple(
+            "/" + str(p).strip().lstrip("/")
+            for p in item.get("cache_paths") or []
+            if str(p).strip()
+        )
+        routes.append(
+            Route(
+                name=name,
+                path=path,
+                upstream=upstream,
+                cache_ttl=cache_ttl,
+                cache_paths=cache_paths,
+                coalesce=bool(item.get("coalesce", False)),
+                max_connections=_option(item, "max_connections", int),
+                max_keepalive_connections=_option(item, "max_keepalive_connections", int),
+                keepalive_expiry=_option(item, "keepalive_expiry", float),
+                connect_timeout=_option(item, "connect_timeout", float),
+                read_timeout=_option(item, "read_timeout", float),
+                max_in_flight=_option(item, "max_in_flight", int),
+                limits=_load_limits(item.get("limits")),
+                replicas=replicas if len(replicas) > 1 else (),
+                balancer=str(item.get("balancer") or "least_outstanding"),
+            )
+        )
+
+    return routes
+
+
+def load_routes_file(path: str) -> List[Route]:
+    with open(path, encoding="utf-8") as routes_file:
+        items = json.load(routes_file)
+    routes = parse_routes(items)
+    if not routes:
+        raise ValueError(f"no valid routes in {path}")
+    return routes
+
+
 class Settings:
     def __init__(self) -> None:
         self.env = os.getenv("ENV", "development")
+        # JSON file in the `GATEWAY_ROUTES` format; takes precedence over the
+        # variable and can be reloaded at runtime.
+        self.routes_file = os.getenv("GATEWAY_ROUTES_FILE", "").strip()
+        self.routes_watch_seconds = float(os.getenv("GATEWAY_ROUTES_WATCH_SECONDS", "0"))
+        self.routes_drain_seconds = float(os.getenv("GATEWAY_ROUTES_DRAIN_SECONDS", "600"))
+        self.admin_token = os.getenv("GATEWAY_ADMIN_TOKEN", "")
         self.gateway_routes = self._load_routes()
         self.cors_allow_origins = self._load_cors_origins()
         self.timeout_seconds = float(os.getenv("GATEWAY_TIMEOUT", "60"))
+        self.connect_timeout_seconds = float(os.getenv("GATEWAY_CONNECT_TIMEOUT", "5"))
+        self.max_connections = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = int(os.getenv("GATEWAY_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.keepalive_expiry = float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", "5"))
+        # 0 disables the per-route in-flight cap.
+        self.max_in_flight = int(os.getenv("GATEWAY_MAX_IN_FLIGHT", "0"))
+        self.breaker_failure_threshold = int(os.getenv("GATEWAY_BREAKER_FAILURES", "5"))
+        self.breaker_reset_seconds = float(os.getenv("GATEWAY_BREAKER_RESET_SECONDS", "15"))
+        self.retry_attempts = int(os.getenv("GATEWAY_RETRY_ATTEMPTS", "2"))
+        self.retry_backoff_seconds = float(os.getenv("GATEWAY_RETRY_BACKOFF_SECONDS", "0.1"))
+        self.compression = os.getenv("GATEWAY_COMPRESSION", "true").strip().lower() not in {"0", "false", "no"}
+        self.compression_min_bytes = int(os.getenv("GATEWAY_COMPRESSION_MIN_BYTES", "1024"))
+        self.compression_level = int(os.getenv("GATEWAY_COMPRESSION_LEVEL", "5"))
+        self.compression_types = [
+            t.strip()
+            for t in os.getenv(
+                "GATEWAY_COMPRESSION_TYPES",
+                "application/json,text/,application/javascript,application/xml,image/svg+xml",
+            ).split(",")
+            if t.strip()
+        ]
+        self.streaming = os.getenv("GATEWAY_STREAMING", "true").strip().lower() not in {"0", "false", "no"}
+        self.stream_chunk_size = int(os.getenv("GATEWAY_STREAM_CHUNK_SIZE", "65536"))
+        self.jwt_secret_key = os.getenv("SECRET_KEY", "")
+        self.jwt_algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+        # RS256/ES256 tokens are verified against auth's published keys.
+        self.jwks_url = os.getenv("JWKS_URL", "")
+        self.jwks_cache_seconds = float(os.getenv("JWKS_CACHE_SECONDS", "300"))
+        self.jwks_min_refresh_seconds = float(os.getenv("JWKS_MIN_REFRESH_SECONDS", "30"))
+        # Same switch as auth's; once JWKS_URL is set HS256 is off unless asked for.
+        accept_hs256 = os.getenv("JWT_ACCEPT_HS256", "" if self.jwks_url else "true")
+        self.jwt_accept_hs256 = accept_hs256.strip().lower() in {"1", "true", "yes"}
+        self.identity_secret = os.getenv("IDENTITY_SECRET", "")
+        self.identity_enabled = bool((self.jwt_secret_key or self.jwks_url) and self.identity_secret)
+        self.cache_max_entries = int(os.getenv("GATEWAY_CACHE_MAX_ENTRIES", "1024"))
+        self.cache_max_body_bytes = int(os.getenv("GATEWAY_CACHE_MAX_BODY_BYTES", "1048576"))
+        self.batch_max_requests = int(os.getenv("GATEWAY_BATCH_MAX_REQUESTS", "20"))
+        self.batch_timeout_seconds = float(os.getenv("GATEWAY_BATCH_TIMEOUT", "30"))
+        self.coalesce_max_body_bytes = int(os.getenv("GATEWAY_COALESCE_MAX_BODY_BYTES", "4194304"))
+        self.replica_failure_threshold = int(os.getenv("GATEWAY_REPLICA_FAILURES", "3"))
+        self.replica_ejection_seconds = float(os.getenv("GATEWAY_REPLICA_EJECTION_SECONDS", "10"))
+        self.access_log = os.getenv("GATEWAY_ACCESS_LOG", "true").strip().lower() not in {"0", "false", "no"}
 
     def _load_routes(self) -> List[Route]:
+        if self.routes_file:
+            try:
+                return load_routes_file(self.routes_file)
+            except (OSError, ValueError):
+                pass
+
         raw = os.getenv("GATEWAY_ROUTES", "[]").strip()
         if not raw or raw == "[]":
             return DEFAULT_ROUTES
@@ -48,20 +235,7 @@ class Settings:
         except json.JSONDecodeError:
             return DEFAULT_ROUTES
 
-        routes: List[Route] = []
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-            name = str(item.get("name") or item.get("path") or "route")
-            path = str(item.get("path") or "").strip()
-            upstream = str(item.get("upstream") or "").strip()
-            if not path or not upstream:
-                continue
-            if not path.startswith("/"):
-                path = "/" + path
-            routes.append(Route(name=name, path=path, upstream=upstream))
-
-        return routes or DEFAULT_ROUTES
+        return parse_routes(items) or DEFAULT_ROUTES
 
     def _load_cors_origins(self) -> List[str]:
         raw = os.getenv("CORS_ALLOW_ORIGINS", "*")
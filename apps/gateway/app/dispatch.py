@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import Route
+from app.pools import UpstreamPool
+
+ProxyHandler = Callable[[UpstreamPool, Request, str], Awaitable[Response]]
+
+
+@dataclass
+class _Node:
+    children: Dict[str, "_Node"] = field(default_factory=dict)
+    route: Optional[Route] = None
+
+
+def _segments(path: str) -> list[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+class PrefixTrie:
+    """Longest-prefix lookup of routes by whole path segments.
+
+    `/inventory` matches `/inventory` and `/inventory/items` but not
+    `/inventory-audit`, the same semantics as the previous
+    `APIRouter(prefix=...)` + `/{path:path}` registration.
+    """
+
+    def __init__(self, routes: Iterable[Route]) -> None:
+        self._root = _Node()
+        for route in routes:
+            node = self._root
+            for segment in _segments(route.path):
+                node = node.children.setdefault(segment, _Node())
+            # First definition wins, as it did with FastAPI route ordering.
+            if node.route is None:
+                node.route = route
+
+    def match(self, path: str) -> Optional[Tuple[Route, str]]:
+        node = self._root
+        best: Optional[Tuple[Route, int]] = None
+        segments = _segments(path)
+        for depth, segment in enumerate(segments):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.route is not None:
+                best = (node.route, depth + 1)
+        if best is None:
+            return None
+        route, depth = best
+        return route, "/".join(segments[depth:])
+
+
+class RouteTable:
+    """Immutable snapshot of the routes, their trie and their upstream pools.
+
+    Reloading builds a new table and swaps the reference; a request resolves
+    its pool once, up front, so it finishes on the table it started with.
+    """
+
+    def __init__(self, routes: Iterable[Route], pools: Dict[str, UpstreamPool], version: int = 1) -> None:
+        self.routes: List[Route] = list(routes)
+        self.trie = PrefixTrie(self.routes)
+        self.pools = pools
+        self.version = version
+
+    @classmethod
+    def build(cls, routes: Iterable[Route], previous: Optional["RouteTable"] = None) -> "RouteTable":
+        """Create pools for new or changed routes and keep the rest from `previous`.
+
+        Unchanged routes keep their clients, breakers and balancer state.
+        """
+        routes = list(routes)
+        pools: Dict[str, UpstreamPool] = {}
+        for route in routes:
+            if route.name in pools:
+                continue
+            existing = previous.pools.get(route.name) if previous is not None else None
+            if existing is not None and existing.route == route:
+                pools[route.name] = existing
+            else:
+                pools[route.name] = UpstreamPool.for_route(route)
+        version = previous.version + 1 if previous is not None else 1
+        return cls(routes, pools, version)
+
+    def retired_by(self, replacement: "RouteTable") -> List[UpstreamPool]:
+        """Pools of this table that `replacement` no longer uses."""
+        kept = {id(pool) for pool in replacement.pools.values()}
+        return [pool for pool in self.pools.values() if id(pool) not in kept]
+
+    def match(self, path: str) -> Optional[Tuple[UpstreamPool, str]]:
+        match = self.trie.match(path)
+        if match is None:
+            return None
+        route, upstream_path = match
+        return self.pools[route.name], upstream_path
+
+
+def gateway_error(exc: Exception) -> Response:
+    if isinstance(exc, HTTPException):
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
+            headers=exc.headers,
+        )
+    return JSONResponse(
+        status_code=502,
+        content={"error": "gateway_error", "detail": str(exc)},
+    )
+
+
+class ProxyDispatcher:
+    """ASGI fast path that sends proxied traffic straight to the proxy handler.
+
+    Requests that do not match a route prefix fall through to the wrapped
+    FastAPI app (`/health`, `/routes`, `/metrics`, docs).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        table: Callable[[], RouteTable],
+        handler: ProxyHandler,
+    ) -> None:
+        self.app = app
+        self.table = table
+        self.handler = handler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        match = self.table().match(scope["path"])
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+
+        pool, upstream_path = match
+        request = Request(scope, receive)
+        try:
+            response = await self.handler(pool, request, upstream_path)
+        except Exception as exc:
+            response = gateway_error(exc)
+        await response(scope, receive, send)
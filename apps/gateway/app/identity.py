@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Optional
+
+from jose import JWTError, jwt
+
+from app.config import settings
+from app.jwks import JWKSVerifier
+
+IDENTITY_HEADER = "X-Identity"
+
+jwks_verifier: Optional[JWKSVerifier] = (
+    JWKSVerifier(
+        settings.jwks_url,
+        cache_seconds=settings.jwks_cache_seconds,
+        min_refresh_seconds=settings.jwks_min_refresh_seconds,
+    )
+    if settings.jwks_url
+    else None
+)
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def _bearer_token(authorization: str) -> Optional[str]:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def _verify_shared_secret(token: str) -> Optional[dict[str, Any]]:
+    if not settings.jwt_secret_key or not settings.jwt_accept_hs256:
+        return None
+    # With JWT_ACCEPT_HS256 on, this still accepts HS256 tokens issued before
+    # a switch to RS256.
+    algorithm = settings.jwt_algorithm if settings.jwt_algorithm.startswith("HS") else "HS256"
+    try:
+        return jwt.decode(token, settings.jwt_secret_key, algorithms=[algorithm])
+    except JWTError:
+        return None
+
+
+async def verify_access_token(token: str) -> Optional[dict[str, Any]]:
+    payload = None
+    if jwks_verifier is not None:
+        payload = await jwks_verifier.verify(token)
+    if payload is None:
+        payload = _verify_shared_secret(token)
+    if payload is None:
+        return None
+    if payload.get("type") != "access" or not payload.get("sub"):
+        return None
+    return payload
+
+
+def sign_identity(payload: dict[str, Any], token: str) -> str:
+    envelope = {
+        "id": int(payload["sub"]),
+        "roles": list(payload.get("roles") or []),
+        "permissions": list(payload.get("permissions") or []),
+        "exp": int(payload["exp"]),
+        "tid": token_fingerprint(token),
+    }
+    body = _b64encode(json.dumps(envelope, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.new(
+        settings.identity_secret.encode("utf-8"),
+        body.encode("ascii"),
+        hashlib.sha256,
+    ).digest()
+    return f"{body}.{_b64encode(signature)}"
+
+
+async def apply_identity(headers: dict) -> None:
+    """Replace any client-supplied identity with one derived from the bearer token.
+
+    Services trust `X-Identity` only when its HMAC verifies, but stripping it
+    here keeps a forged header from ever reaching them. Requests with a
+    missing or invalid token are forwarded untouched so the service still
+    answers with its usual 401.
+    """
+    for key in [k for k in headers if k.lower() == IDENTITY_HEADER.lower()]:
+        del headers[key]
+
+    if not settings.identity_enabled:
+        return
+
+    authorization = next(
+        (value for key, value in headers.items() if key.lower() == "authorization"),
+        "",
+    )
+    token = _bearer_token(authorization)
+    if not token:
+        return
+
+    payload = await verify_access_token(token)
+    if payload is None:
+        return
+    headers[IDENTITY_HEADER] = sign_identity(payload, token)
@@ -1,34 +1,101 @@
 from __future__ import annotations
 
-from typing import Callable
+import asyncio
+import hmac
+import logging
+import os
+import time
+from typing import Any, Callable, List, Optional, Tuple
 
-import httpx
-from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-from app.config import Route, settings
-from app.proxy import forward_request
+from app.admission import find_limiter
+from app.batch import BatchRequest, run_batch
+from app.cache import CachedResponse, ResponseCache, cache_key
+from app.coalesce import SingleFlight
+from app.compression import CompressionMiddleware
+from app.config import Route, load_routes_file, parse_routes, settings
+from app.dispatch import ProxyDispatcher, RouteTable, gateway_error
+from app.identity import jwks_verifier
+from app.pools import UpstreamPool, release_after
+from app.proxy import filter_response_headers, forward_response, read_raw, stream_response
+from app.tracing import TracingMiddleware, annotate_upstream_timing, configure_logging
 
 app = FastAPI(title="API Gateway", version="1.0.0")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_allow_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"]
-)
+logger = logging.getLogger(__name__)
 
 
 @app.on_event("startup")
 async def startup() -> None:
-    app.state.http_client = httpx.AsyncClient(timeout=settings.timeout_seconds)
+    configure_logging()
+    app.state.route_table = RouteTable.build(settings.gateway_routes)
+    app.state.routes_lock = asyncio.Lock()
+    app.state.draining = set()
+    app.state.response_cache = ResponseCache(
+        max_entries=settings.cache_max_entries,
+        max_body_bytes=settings.cache_max_body_bytes,
+    )
+    app.state.singleflight = SingleFlight()
+    app.state.routes_watcher = None
+    if settings.routes_file and settings.routes_watch_seconds > 0:
+        app.state.routes_watcher = asyncio.create_task(watch_routes_file())
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
-    await app.state.http_client.aclose()
+    if app.state.routes_watcher is not None:
+        app.state.routes_watcher.cancel()
+    for task in list(app.state.draining):
+        task.cancel()
+    for pool in app.state.route_table.pools.values():
+        await pool.aclose()
+    if jwks_verifier is not None:
+        await jwks_verifier.aclose()
+
+
+async def reload_routes(routes: List[Route]) -> RouteTable:
+    """Swap in a new route table; pools of changed routes drain in the background."""
+    async with app.state.routes_lock:
+        previous: RouteTable = app.state.route_table
+        table = RouteTable.build(routes, previous)
+        app.state.route_table = table
+        for pool in previous.retired_by(table):
+            app.state.response_cache.invalidate(pool.route.name)
+            task = asyncio.create_task(pool.drain(settings.routes_drain_seconds))
+            app.state.draining.add(task)
+            task.add_done_callback(app.state.draining.discard)
+    logger.info("route table v%s loaded with %s routes", table.version, len(table.routes))
+    return table
+
+
+def _routes_file_mtime() -> Optional[float]:
+    try:
+        return os.stat(settings.routes_file).st_mtime
+    except OSError:
+        return None
+
+
+async def watch_routes_file() -> None:
+    last_mtime = _routes_file_mtime()
+    while True:
+        await asyncio.sleep(settings.routes_watch_seconds)
+        mtime = _routes_file_mtime()
+        if mtime is None or mtime == last_mtime:
+            continue
+        last_mtime = mtime
+        try:
+            await reload_routes(load_routes_file(settings.routes_file))
+        except (OSError, ValueError) as exc:
+            logger.warning("route table not reloaded from %s: %s", settings.routes_file, exc)
+
+
+def require_admin(x_admin_token: str = Header(default="")) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="admin_disabled")
+    if not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="invalid_admin_token")
 
 
 @app.get("/health")
@@ -38,37 +105,225 @@ async def health() -> dict:
 
 @app.get("/routes")
 async def routes() -> dict:
+    table: RouteTable = app.state.route_table
     return {
+        "version": table.version,
         "routes": [
-            {"name": r.name, "path": r.path, "upstream": r.upstream}
-            for r in settings.gateway_routes
-        ]
+            {
+                "name": r.name,
+                "path": r.path,
+                "upstream": r.upstream,
+                "upstreams": list(r.upstreams),
+                "balancer": r.balancer,
+                "cache_ttl": r.cache_ttl,
+                "cache_paths": list(r.cache_paths),
+                "coalesce": r.coalesce,
+                "breaker": table.pools[r.name].breaker.snapshot() if r.name in table.pools else None,
+            }
+            for r in table.routes
+        ],
     }
 
 
-def register_proxy_route(route: Route) -> None:
-    router = APIRouter(prefix=route.path)
+@app.post("/routes/reload", dependencies=[Depends(require_admin)])
+async def reload_routes_file() -> dict:
+    if not settings.routes_file:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="routes_file_not_configured",
+        )
+    try:
+        routes = load_routes_file(settings.routes_file)
+    except (OSError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"invalid_routes: {exc}")
+    table = await reload_routes(routes)
+    return {"version": table.version, "routes": len(table.routes)}
+
+
+@app.put("/routes", dependencies=[Depends(require_admin)])
+async def replace_routes(items: List[Any] = Body(...)) -> dict:
+    routes = parse_routes(items)
+    if not routes:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invalid_routes")
+    table = await reload_routes(routes)
+    return {"version": table.version, "routes": len(table.routes)}
 
-    async def handler(request: Request, path: str = ""):
-        client = app.state.http_client
-        return await forward_request(client, request, route.upstream, path)
 
-    methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
-    router.add_api_route("", handler, methods=methods)
-    router.add_api_route("/{path:path}", handler, methods=methods)
+@app.get("/metrics")
+async def metrics() -> dict:
+    pools = app.state.route_table.pools
+    return {
+        "cache": app.state.response_cache.snapshot(),
+        "coalescing": app.state.singleflight.snapshot(),
+        "admission": {
+            name: [limiter.snapshot() for limiter in pool.limiters]
+            for name, pool in pools.items()
+            if pool.limiters
+        },
+        "upstreams": {
+            name: pool.snapshot() for name, pool in pools.items()
+        },
+    }
+
 
-    app.include_router(router)
+BUFFERABLE_METHODS = {"GET"}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+async def fetch_shareable(
+    pool: UpstreamPool,
+    request: Request,
+    path: str,
+    max_body_bytes: int,
+) -> Tuple[Optional[Response], Optional[CachedResponse]]:
+    """Fetch upstream, buffering the body only when it is small and sized.
+
+    Returns `(None, snapshot)` for a buffered body that can be cached or
+    fanned out, or `(streaming_response, None)` for anything else.
+    """
+    response, done = await pool.send(request, path)
+    content_length = response.headers.get("content-length")
+    shareable = (
+        content_length is not None
+        and content_length.isdigit()
+        and int(content_length) <= max_body_bytes
+    )
+    if not shareable:
+        return release_after(stream_response(response), done), None
+
+    try:
+        body = await read_raw(response)
+    finally:
+        done()
+    snapshot = CachedResponse(
+        status_code=response.status_code,
+        headers=filter_response_headers(response),
+        body=body,
+        cache_control=response.headers.get("cache-control", ""),
+    )
+    return None, snapshot
 
 
-for route in settings.gateway_routes:
-    register_proxy_route(route)
+async def forward(pool: UpstreamPool, request: Request, path: str) -> Response:
+    response, done = await pool.send(request, path)
+    try:
+        forwarded = await forward_response(request, response)
+    except BaseException:
+        done()
+        raise
+    return release_after(forwarded, done)
+
+
+async def buffered_get(
+    pool: UpstreamPool,
+    request: Request,
+    path: str,
+) -> Response:
+    route = pool.route
+    cache: ResponseCache = app.state.response_cache
+    flight: SingleFlight = app.state.singleflight
+    key = cache_key(route.name, request)
+
+    cacheable = route.is_cacheable(path)
+    if cacheable:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached.to_response()
+
+    max_body_bytes = max(
+        cache.max_body_bytes if cacheable else 0,
+        settings.coalesce_max_body_bytes if route.coalesce else 0,
+    )
+
+    async def fetch() -> Tuple[Optional[Response], Optional[CachedResponse]]:
+        own, snapshot = await fetch_shareable(pool, request, path, max_body_bytes)
+        if cacheable and snapshot is not None and snapshot.storable:
+            cache.set(key, snapshot.with_ttl(route.cache_ttl))
+        return own, snapshot
+
+    if route.coalesce:
+        own, snapshot = await flight.do(route.name, key, fetch)
+    else:
+        own, snapshot = await fetch()
+
+    if snapshot is None:
+        return own
+    return snapshot.to_response()
+
+
+async def dispatch(
+    pool: UpstreamPool,
+    request: Request,
+    path: str,
+) -> Response:
+    route = pool.route
+    cache = app.state.response_cache
+    if route.cache_ttl > 0 and request.method not in SAFE_METHODS:
+        # Drop before and after the write so a GET racing with it cannot
+        # leave a pre-write body in the cache.
+        cache.invalidate(route.name)
+        try:
+            return await forward(pool, request, path)
+        finally:
+            cache.invalidate(route.name)
+    if request.method in BUFFERABLE_METHODS and (route.coalesce or route.is_cacheable(path)):
+        return await buffered_get(pool, request, path)
+    return await forward(pool, request, path)
+
+
+async def proxy(pool: UpstreamPool, request: Request, path: str) -> Response:
+    route = pool.route
+    await pool.before_request()
+
+    releases = []
+    limiter = find_limiter(pool.limiters, request.method, path)
+    try:
+        if limiter is not None:
+            releases.append(await limiter.acquire())
+        releases.append(await pool.acquire())
+        started = time.perf_counter()
+        response = await dispatch(pool, request, path)
+    except BaseException:
+        for release in releases:
+            release()
+        raise
+    annotate_upstream_timing(response, route.name, time.perf_counter() - started)
+    return release_after(response, *releases)
+
+
+@app.post("/batch")
+async def batch(payload: BatchRequest, request: Request) -> dict:
+    return await run_batch(
+        request,
+        payload,
+        table=app.state.route_table,
+        handler=proxy,
+        default_timeout=settings.batch_timeout_seconds,
+        max_requests=settings.batch_max_requests,
+    )
+
+
+# Proxied prefixes are matched by ProxyDispatcher before FastAPI routing;
+# compression and CORS wrap it so they apply to both paths.
+app.add_middleware(ProxyDispatcher, table=lambda: app.state.route_table, handler=proxy)
+if settings.compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_bytes,
+        content_types=settings.compression_types,
+        level=settings.compression_level,
+    )
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.cors_allow_origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Server-Timing"],
+)
+app.add_middleware(TracingMiddleware, access_log=settings.access_log)
 
 
 @app.exception_handler(Exception)
 async def unhandled_exception(request: Request, exc: Exception) -> JSONResponse:
-    if isinstance(exc, HTTPException):
-        raise exc
-    return JSONResponse(
-        status_code=502,
-        content={"error": "gateway_error", "detail": str(exc)},
-    )
+    return gateway_error(exc)
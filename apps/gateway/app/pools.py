@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, Request, Response, status
+from starlette.background import BackgroundTask
+
+from app.admission import AdmissionLimiter
+from app.balancer import Balancer
+from app.breaker import FAILURE_STATUSES, CircuitBreaker, health_url
+from app.config import Route, settings
+from app.proxy import send_upstream
+
+
+def _pick(value, default):
+    return default if value is None else value
+
+
+@dataclass
+class UpstreamPool:
+    """Dedicated client and in-flight cap for one route's upstream."""
+
+    route: Route
+    client: httpx.AsyncClient
+    limits: httpx.Limits
+    max_in_flight: int
+    breaker: CircuitBreaker
+    balancer: Balancer
+    limiters: List[AdmissionLimiter] = field(default_factory=list)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+    in_flight: int = 0
+    rejected: int = 0
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight > 0:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    @classmethod
+    def for_route(cls, route: Route) -> "UpstreamPool":
+        read_timeout = _pick(route.read_timeout, settings.timeout_seconds)
+        connect_timeout = _pick(route.connect_timeout, settings.connect_timeout_seconds)
+        timeout = httpx.Timeout(
+            read_timeout,
+            connect=connect_timeout,
+            pool=connect_timeout,
+        )
+        limits = httpx.Limits(
+            max_connections=_pick(route.max_connections, settings.max_connections),
+            max_keepalive_connections=_pick(
+                route.max_keepalive_connections, settings.max_keepalive_connections
+            ),
+            keepalive_expiry=_pick(route.keepalive_expiry, settings.keepalive_expiry),
+        )
+        return cls(
+            route=route,
+            client=httpx.AsyncClient(timeout=timeout, limits=limits),
+            limits=limits,
+            max_in_flight=_pick(route.max_in_flight, settings.max_in_flight),
+            breaker=CircuitBreaker(
+                health_urls=[health_url(url) for url in route.upstreams],
+                failure_threshold=settings.breaker_failure_threshold,
+                reset_seconds=settings.breaker_reset_seconds,
+            ),
+            balancer=Balancer.for_urls(
+                route.upstreams,
+                strategy=route.balancer,
+                failure_threshold=settings.replica_failure_threshold,
+                ejection_seconds=settings.replica_ejection_seconds,
+            ),
+            limiters=[AdmissionLimiter(rule) for rule in route.limits],
+        )
+
+    async def before_request(self) -> None:
+        """Fail fast while the circuit is open.
+
+        The half-open probe covers every replica the balancer has not
+        ejected (all of them if none is left). Replicas that answer are put
+        back in rotation and the rest ejected, so the trial traffic goes to
+        one that answered.
+        """
+        now = time.monotonic()
+        replicas = [r for r in self.balancer.replicas if r.available(now)] or self.balancer.replicas
+        healthy = await self.breaker.before_request(self.client, [health_url(r.url) for r in replicas])
+        if healthy is None:
+            return
+        for replica in replicas:
+            if health_url(replica.url) in healthy:
+                self.balancer.restore(replica)
+            else:
+                self.balancer.eject(replica)
+
+    async def send(self, request: Request, path: str) -> Tuple[httpx.Response, Callable[[], None]]:
+        """Open the upstream request on a replica picked now.
+
+        Returns the response and the function to call once its body has been
+        read or passed on. Only requests that really reach an upstream come
+        through here; cache hits and requests that share another one's
+        in-flight call do not, so they count against neither the balancer
+        nor the breaker.
+        """
+        replica = self.balancer.pick()
+        self.balancer.start(replica)
+        try:
+            response = await send_upstream(self.client, request, replica.url, path)
+        except BaseException as exc:
+            unreachable = isinstance(exc, httpx.TransportError)
+            if unreachable:
+                self.breaker.record(None)
+            self.balancer.finish(replica, ok=not unreachable)
+            raise
+        self.breaker.record(response.status_code)
+        ok = response.status_code not in FAILURE_STATUSES
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            self.balancer.finish(replica, ok=ok)
+
+        return response, finish
+
+    async def acquire(self) -> Callable[[], None]:
+        """Reserve an in-flight slot and return the function that frees it.
+
+        Waiting is bounded by the route's pool timeout; past that the request
+        fails fast with 503 instead of queueing behind a slow upstream.
+        """
+        if self._semaphore is not None:
+            try:
+                await asyncio.wait_for(
+                    self._semaphore.acquire(),
+                    timeout=self.client.timeout.pool,
+                )
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="upstream_busy",
+                )
+        self.in_flight += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+        return release
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "rejected": self.rejected,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "connect_timeout": self.client.timeout.connect,
+            "read_timeout": self.client.timeout.read,
+            "balancer": self.balancer.snapshot(),
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def drain(self, timeout: float) -> None:
+        """Close the client once the requests still using this pool are done.
+
+        Requests waiting in an admission queue or for an in-flight slot hold
+        the pool before they are counted, so closing waits out those windows
+        first. Anything still running after `timeout` is cut off.
+        """
+        deadline = time.monotonic() + timeout
+        grace = self.client.timeout.pool or 0.0
+        grace += max((limiter.rule.queue_timeout for limiter in self.limiters), default=0.0)
+        try:
+            await asyncio.sleep(min(grace, timeout))
+            while self.in_flight > 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.5)
+        finally:
+            await self.aclose()
+
+
+def release_after(response: Response, *releases: Callable[[], None]) -> Response:
+    """Free slots once the response body has been sent, not when headers are."""
+    background = response.background
+
+    async def run() -> None:
+        try:
+            if background is not None:
+                await background()
+        finally:
+            for release in releases:
+                release()
+
+    response.background = BackgroundTask(run)
+    return response
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from typing import Iterable, Mapping, Optional
+import asyncio
+import random
+from typing import AsyncIterator, Iterable, Mapping, Optional
 
 import httpx
 from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.config import settings
+from app.identity import apply_identity
 
 HOP_BY_HOP_HEADERS = {
     "connection",
@@ -16,6 +23,13 @@ HOP_BY_HOP_HEADERS = {
     "upgrade",
 }
 
+EVENT_STREAM = "text/event-stream"
+
+RETRYABLE_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUSES = {502, 503, 504}
+# Errors raised before the upstream could have acted on the request.
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
 
 def _filtered_headers(headers: Mapping[str, str]) -> dict:
     filtered = {}
@@ -42,33 +56,154 @@ def _filter_response_headers(headers: Iterable[tuple[str, str]]) -> dict:
     return filtered
 
 
-async def forward_request(
-    client: httpx.AsyncClient,
-    request: Request,
-    upstream: str,
-    upstream_path: str,
-) -> Response:
+def _build_url(request: Request, upstream: str, upstream_path: str) -> str:
     if upstream_path:
         url = upstream.rstrip("/") + "/" + upstream_path.lstrip("/")
     else:
         url = upstream.rstrip("/")
     if request.url.query:
         url = f"{url}?{request.url.query}"
+    return url
+
+
+def _has_body(request: Request) -> bool:
+    return "content-length" in request.headers or "transfer-encoding" in request.headers
+
+
+async def _request_stream(request: Request) -> AsyncIterator[bytes]:
+    # Chunks are passed through as uvicorn receives them, so at most one
+    # ASGI message is held in memory per in-flight upload.
+    async for chunk in request.stream():
+        if chunk:
+            yield chunk
+
+
+def _wants_event_stream(request: Request) -> bool:
+    return EVENT_STREAM in request.headers.get("accept", "").lower()
+
+
+def _is_live_stream(response: httpx.Response) -> bool:
+    content_type = response.headers.get("content-type", "").lower()
+    if content_type.startswith(EVENT_STREAM):
+        return True
+    if "content-length" in response.headers:
+        return False
+    return "chunked" in response.headers.get("transfer-encoding", "").lower()
+
+
+async def _response_stream(
+    response: httpx.Response,
+    chunk_size: Optional[int],
+) -> AsyncIterator[bytes]:
+    # Closing the upstream response on exit (including cancellation when the
+    # client disconnects) drops the upstream connection, which in turn lets
+    # the service notice the disconnect and stop producing events.
+    try:
+        async for chunk in response.aiter_raw(chunk_size):
+            yield chunk
+    finally:
+        await response.aclose()
+
 
+async def send_upstream(
+    client: httpx.AsyncClient,
+    request: Request,
+    upstream: str,
+    upstream_path: str,
+) -> httpx.Response:
+    """Open the upstream request; the caller must consume or close the response."""
+    url = _build_url(request, upstream, upstream_path)
     headers = _filtered_headers(request.headers)
     _merge_x_forwarded(request, headers)
+    await apply_identity(headers)
 
-    body = await request.body()
+    timeout = httpx.USE_CLIENT_DEFAULT
+    if _wants_event_stream(request):
+        # Event streams may stay silent for longer than the regular timeout.
+        default = client.timeout
+        timeout = httpx.Timeout(
+            connect=default.connect,
+            read=None,
+            write=default.write,
+            pool=default.pool,
+        )
+
+    has_body = _has_body(request)
+    attempts = 1
+    if request.method in RETRYABLE_METHODS and not has_body:
+        attempts += max(0, settings.retry_attempts)
+
+    attempt = 1
+    while True:
+        upstream_request = client.build_request(
+            request.method,
+            url,
+            headers=headers,
+            content=_request_stream(request) if has_body else None,
+            timeout=timeout,
+        )
+        try:
+            response = await client.send(upstream_request, stream=True)
+        except RETRYABLE_ERRORS:
+            if attempt >= attempts:
+                raise
+        else:
+            if attempt >= attempts or response.status_code not in RETRYABLE_STATUSES:
+                if _is_live_stream(response):
+                    _drop_read_timeout(response)
+                return response
+            await response.aclose()
+        await asyncio.sleep(_backoff(attempt))
+        attempt += 1
+
+
+def _drop_read_timeout(response: httpx.Response) -> None:
+    # Live streams may stay silent for longer than the regular timeout, which
+    # then only bounds the wait for the headers. The transport looks the
+    # timeout up in the request extensions again when the body is read.
+    timeouts = response.request.extensions.get("timeout", {})
+    response.request.extensions["timeout"] = {**timeouts, "read": None}
 
-    response = await client.request(
-        request.method,
-        url,
-        headers=headers,
-        content=body,
-    )
 
-    return Response(
-        content=response.content,
+def _backoff(attempt: int) -> float:
+    # Full jitter: spread retries from concurrent clients over the window.
+    return random.uniform(0, settings.retry_backoff_seconds * (2 ** (attempt - 1)))
+
+
+def stream_response(response: httpx.Response) -> StreamingResponse:
+    response_headers = _filter_response_headers(response.headers.items())
+    chunk_size: Optional[int] = settings.stream_chunk_size
+    if _is_live_stream(response):
+        # Flush every chunk as soon as it arrives instead of filling a buffer.
+        chunk_size = None
+        response_headers.setdefault("Cache-Control", "no-cache")
+        response_headers["X-Accel-Buffering"] = "no"
+
+    return StreamingResponse(
+        _response_stream(response, chunk_size),
         status_code=response.status_code,
-        headers=_filter_response_headers(response.headers.items()),
+        headers=response_headers,
+        background=BackgroundTask(response.aclose),
     )
+
+
+async def read_raw(response: httpx.Response) -> bytes:
+    try:
+        return b"".join([chunk async for chunk in response.aiter_raw()])
+    finally:
+        await response.aclose()
+
+
+def filter_response_headers(response: httpx.Response) -> dict:
+    return _filter_response_headers(response.headers.items())
+
+
+async def forward_response(request: Request, response: httpx.Response) -> Response:
+    """Pass an open upstream response on to the client."""
+    if not settings.streaming and not _is_live_stream(response):
+        return Response(
+            content=await read_raw(response),
+            status_code=response.status_code,
+            headers=_filter_response_headers(response.headers.items()),
+        )
+    return stream_response(response)
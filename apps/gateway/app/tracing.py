@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+import uuid
+from typing import Optional
+
+from fastapi import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "X-Request-ID"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+# Split on commas that are not inside a quoted `desc="..."`.
+_ENTRY_SEPARATOR = re.compile(r',(?=(?:[^"]*"[^"]*")*[^"]*$)')
+_UPSTREAM_DURATION = re.compile(r'(?:^|,)\s*upstream;dur=([0-9.]+)')
+
+access_logger = logging.getLogger("gateway.access")
+
+
+def configure_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    # One line per proxied request is already written to the access log.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def _entries(value: str) -> list[str]:
+    return [entry.strip() for entry in _ENTRY_SEPARATOR.split(value) if entry.strip()]
+
+
+def annotate_upstream_timing(response: Response, route_name: str, seconds: float) -> None:
+    """Namespace the service's Server-Timing entries by route and add the hop time.
+
+    `inventory` reporting `db;dur=12` becomes `inventory-db;dur=12`, followed by
+    `upstream;dur=...` measured at the gateway up to the response headers.
+    """
+    entries = [
+        f"{route_name}-{entry}"
+        for value in response.headers.getlist(SERVER_TIMING_HEADER)
+        for entry in _entries(value)
+    ]
+    entries.append(f'upstream;dur={seconds * 1000:.1f};desc="{route_name}"')
+    del response.headers[SERVER_TIMING_HEADER]
+    response.headers[SERVER_TIMING_HEADER] = ", ".join(entries)
+
+
+class TracingMiddleware:
+    """Adopt or mint `X-Request-ID`, finish Server-Timing and write the access log.
+
+    The id is written back into the request headers so the proxy forwards it
+    to the upstream service with the rest of the client headers.
+    """
+
+    def __init__(self, app: ASGIApp, access_log: bool = True) -> None:
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = MutableHeaders(scope=scope)
+        request_id = request_headers.get(REQUEST_ID_HEADER)
+        if not request_id or not _REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+            request_headers[REQUEST_ID_HEADER] = request_id
+
+        started = time.perf_counter()
+        status_code = 500
+        server_timing = ""
+
+        async def send_with_tracing(message: Message) -> None:
+            nonlocal status_code, server_timing
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+                server_timing = _finish_server_timing(
+                    headers.get(SERVER_TIMING_HEADER, ""), time.perf_counter() - started
+                )
+                headers[SERVER_TIMING_HEADER] = server_timing
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_tracing)
+        finally:
+            if self.access_log:
+                access_logger.info(
+                    "%s %s %s %.1fms request_id=%s timing=[%s]",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    (time.perf_counter() - started) * 1000,
+                    request_id,
+                    server_timing,
+                )
+
+
+def _finish_server_timing(value: str, total: float) -> str:
+    match = _UPSTREAM_DURATION.search(value)
+    upstream: Optional[float] = float(match.group(1)) / 1000 if match else None
+    gateway = total - upstream if upstream is not None else total
+    entries = _entries(value)
+    entries.append(f"gateway;dur={max(0.0, gateway) * 1000:.1f}")
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
@@ -0,0 +1,106 @@
+"""Per-request routing overhead: FastAPI prefix routes vs. the ASGI prefix trie.
+
+Both apps answer with a fixed body and never touch the network, so the
+difference is purely the cost of getting from the ASGI call to the proxy
+coroutine. Run from `apps/gateway`:
+
+    python -m benchmarks.dispatch_overhead --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from fastapi import APIRouter, FastAPI, Request, Response
+
+from app.config import DEFAULT_ROUTES, Route
+from app.dispatch import ProxyDispatcher, RouteTable
+from app.pools import UpstreamPool
+
+METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
+
+
+async def _stub_proxy(pool: UpstreamPool, request: Request, path: str) -> Response:
+    return Response(content=b"{}", media_type="application/json")
+
+
+def build_fastapi_routed() -> FastAPI:
+    app = FastAPI()
+    pools = RouteTable.build(DEFAULT_ROUTES).pools
+    for route in DEFAULT_ROUTES:
+        router = APIRouter(prefix=route.path)
+
+        def make_handler(bound: Route):
+            async def handler(request: Request, path: str = ""):
+                return await _stub_proxy(pools[bound.name], request, path)
+
+            return handler
+
+        handler = make_handler(route)
+        router.add_api_route("", handler, methods=METHODS)
+        router.add_api_route("/{path:path}", handler, methods=METHODS)
+        app.include_router(router)
+    return app
+
+
+def build_trie_routed() -> FastAPI:
+    app = FastAPI()
+    table = RouteTable.build(DEFAULT_ROUTES)
+    app.add_middleware(ProxyDispatcher, table=lambda: table, handler=_stub_proxy)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"gateway"), (b"authorization", b"Bearer x")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("gateway", 8000),
+    }
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    return None
+
+
+async def measure(app, paths: list[str], requests: int) -> float:
+    for path in paths:  # warm up: builds the middleware stack and route caches
+        await app(_scope(path), _receive, _send)
+    started = time.perf_counter()
+    for index in range(requests):
+        await app(_scope(paths[index % len(paths)]), _receive, _send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    paths = [
+        "/inventory/items/room/12",
+        "/documents/generate",
+        "/auth/me",
+        "/cabinets/rooms/my/3",
+    ]
+    baseline = await measure(build_fastapi_routed(), paths, requests)
+    trie = await measure(build_trie_routed(), paths, requests)
+    print(f"fastapi routes : {baseline:8.1f} us/request")
+    print(f"prefix trie    : {trie:8.1f} us/request")
+    print(f"saved          : {baseline - trie:8.1f} us/request ({(1 - trie / baseline) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
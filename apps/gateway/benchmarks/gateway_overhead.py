@@ -0,0 +1,220 @@
+"""Gateway overhead against local stub upstreams, without Docker.
+
+Starts a stub upstream and the gateway, each under uvicorn in its own child
+process, then drives concurrent load from this process at every scenario
+both directly and through the gateway. Latencies are as seen by the load
+driver; memory figures are the gateway process's alone, with growth measured
+against its idle RSS before any traffic. Run from `apps/gateway`:
+
+    python -m benchmarks.gateway_overhead --requests 500 --concurrency 20
+    python -m benchmarks.gateway_overhead --save baseline.json
+    python -m benchmarks.gateway_overhead --compare baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Optional
+
+import httpx
+
+from benchmarks.stubs import ServerProcess, free_port
+
+SCENARIOS = {
+    "small_json": "/small",
+    "large_json": "/large",
+    "sse_stream": "/sse",
+    "binary_download": "/download",
+}
+# Heavy scenarios get fewer requests so a full run stays within CI budgets.
+REQUEST_SCALE = {"binary_download": 0.1, "sse_stream": 0.5}
+
+
+def rss_bytes(pid: int) -> dict:
+    """Current and peak resident set size of process `pid` (Linux only)."""
+    values = {"rss": None, "peak_rss": None}
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    values["rss"] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    values["peak_rss"] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def drive(base_url: str, path: str, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    first_byte: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(index)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    async with client.stream("GET", path) as response:
+                        ttfb: Optional[float] = None
+                        async for _ in response.aiter_raw():
+                            if ttfb is None:
+                                ttfb = time.perf_counter() - started
+                        if response.status_code != 200:
+                            errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                first_byte.append(ttfb if ttfb is not None else latencies[-1])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        return {"requests": requests, "errors": errors}
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "ttfb_p50_ms": round(statistics.median(first_byte) * 1000, 2),
+    }
+
+
+def run(requests: int, concurrency: int) -> dict:
+    stub = ServerProcess("benchmarks.stubs:build_stub_app", free_port(), factory=True)
+    with stub:
+        gateway_env = {
+            "GATEWAY_ROUTES": json.dumps([{"name": "stub", "path": "/stub", "upstream": stub.url}]),
+            # Keep the report readable; set GATEWAY_ACCESS_LOG=true to include its cost.
+            "GATEWAY_ACCESS_LOG": os.environ.get("GATEWAY_ACCESS_LOG", "false"),
+        }
+        with ServerProcess("app.main:app", free_port(), env=gateway_env) as gateway:
+            idle = rss_bytes(gateway.pid)
+            results: dict = {
+                "requests": requests,
+                "concurrency": concurrency,
+                "cpus": os.cpu_count(),
+                "gateway_idle_rss_bytes": idle["rss"],
+                "scenarios": {},
+            }
+            for name, path in SCENARIOS.items():
+                count = max(concurrency, int(requests * REQUEST_SCALE.get(name, 1)))
+                # Warm connections and first-request paths on both sides.
+                asyncio.run(drive(stub.url, path, concurrency, concurrency))
+                asyncio.run(drive(gateway.url, "/stub" + path, concurrency, concurrency))
+                direct = asyncio.run(drive(stub.url, path, count, concurrency))
+                proxied = asyncio.run(drive(gateway.url, "/stub" + path, count, concurrency))
+                memory = rss_bytes(gateway.pid)
+                results["scenarios"][name] = {
+                    "direct": direct,
+                    "gateway": proxied,
+                    "overhead_p50_ms": _delta(proxied, direct, "p50_ms"),
+                    "overhead_p99_ms": _delta(proxied, direct, "p99_ms"),
+                    "gateway_rss_bytes": memory["rss"],
+                    "gateway_rss_growth_bytes": _delta(memory, idle, "rss"),
+                    "gateway_peak_rss_bytes": memory["peak_rss"],
+                }
+            return results
+
+
+def _delta(current: dict, reference: dict, key: str) -> Optional[float]:
+    if current.get(key) is None or reference.get(key) is None:
+        return None
+    return round(current[key] - reference[key], 2)
+
+
+def _mib(value: Optional[float]) -> float:
+    return value / 1024 / 1024 if value is not None else float("nan")
+
+
+def print_report(results: dict, baseline: Optional[dict]) -> None:
+    header = (
+        f"{'scenario':<16}{'rps':>9}{'p50 ms':>9}{'p99 ms':>9}{'+p50':>8}{'+p99':>8}"
+        f"{'gw MiB':>9}{'+idle MiB':>10}"
+    )
+    if baseline and baseline.get("cpus") != results.get("cpus"):
+        print(f"note: baseline was recorded with {baseline.get('cpus')} CPUs, this run has {results.get('cpus')}")
+    print(header)
+    print("-" * len(header))
+    for name, data in results["scenarios"].items():
+        gateway = data["gateway"]
+        rss = _mib(data["gateway_rss_bytes"])
+        growth = _mib(data["gateway_rss_growth_bytes"])
+        print(
+            f"{name:<16}{gateway.get('rps', 0):>9}{gateway.get('p50_ms', 0):>9}"
+            f"{gateway.get('p99_ms', 0):>9}{data['overhead_p50_ms'] or 0:>8}"
+            f"{data['overhead_p99_ms'] or 0:>8}{rss:>9.1f}{growth:>+10.1f}"
+        )
+        if baseline and name in baseline.get("scenarios", {}):
+            previous = baseline["scenarios"][name]["gateway"]
+            print(
+                f"{'  vs baseline':<16}"
+                f"{_delta(gateway, previous, 'rps') or 0:>+9}"
+                f"{_delta(gateway, previous, 'p50_ms') or 0:>+9}"
+                f"{_delta(gateway, previous, 'p99_ms') or 0:>+9}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON produced by --save")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help="fail if any gateway p50 exceeds the baseline by more than this fraction",
+    )
+    args = parser.parse_args()
+
+    results = run(args.requests, args.concurrency)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if baseline and args.max_regression is not None:
+        for name, data in results["scenarios"].items():
+            previous = baseline.get("scenarios", {}).get(name, {}).get("gateway", {})
+            current = data["gateway"]
+            if previous.get("p50_ms") and current.get("p50_ms"):
+                if current["p50_ms"] > previous["p50_ms"] * (1 + args.max_regression):
+                    print(f"regression: {name} p50 {current['p50_ms']}ms vs {previous['p50_ms']}ms")
+                    return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Local stand-ins for the upstream services, used by the gateway benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+SMALL_JSON = {"id": 1, "name": "Projector", "status": "in_use", "room_id": 12}
+LARGE_JSON = [
+    {
+        "id": i,
+        "name": f"Item {i}",
+        "inventory_number": f"INV-{i:08d}",
+        "status": "in_use",
+        "room_id": i % 300,
+        "responsible_id": i % 1200,
+        "description": "Lorem ipsum dolor sit amet " * 4,
+    }
+    for i in range(5000)
+]
+SSE_EVENTS = 20
+SSE_INTERVAL_SECONDS = 0.005
+DOWNLOAD_BYTES = 16 * 1024 * 1024
+DOWNLOAD_CHUNK = 64 * 1024
+UNAVAILABLE_DELAY_SECONDS = 0.2
+
+
+def build_stub_app() -> FastAPI:
+    app = FastAPI()
+    large_body = JSONResponse(LARGE_JSON).body
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/small")
+    async def small() -> dict:
+        return SMALL_JSON
+
+    @app.get("/large")
+    async def large() -> Response:
+        return Response(large_body, media_type="application/json")
+
+    @app.get("/sse")
+    async def sse() -> StreamingResponse:
+        async def events():
+            for index in range(SSE_EVENTS):
+                yield f"data: {{\"processed\": {index}}}\n\n"
+                await asyncio.sleep(SSE_INTERVAL_SECONDS)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/unavailable")
+    async def unavailable() -> Response:
+        await asyncio.sleep(UNAVAILABLE_DELAY_SECONDS)
+        return Response(status_code=503)
+
+    @app.get("/download")
+    async def download() -> StreamingResponse:
+        chunk = b"\0" * DOWNLOAD_CHUNK
+
+        async def body():
+            for _ in range(DOWNLOAD_BYTES // DOWNLOAD_CHUNK):
+                yield chunk
+
+        return StreamingResponse(
+            body(),
+            media_type="application/pdf",
+            headers={"Content-Length": str(DOWNLOAD_BYTES)},
+        )
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServerThread:
+    """Run an ASGI app under uvicorn on its own thread and event loop."""
+
+    def __init__(self, app, port: int) -> None:
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "ServerThread":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"server on port {self.port} did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+class ServerProcess:
+    """Run an ASGI app under uvicorn in a child process.
+
+    Keeps the server off the load driver's interpreter, so its latency and
+    memory are its own. `app` is a uvicorn import string such as
+    `app.main:app`; `factory=True` calls it to build the app.
+    """
+
+    def __init__(self, app: str, port: int, env: Optional[dict] = None, factory: bool = False) -> None:
+        self.app = app
+        self.port = port
+        self.env = {**os.environ, **(env or {})}
+        self.factory = factory
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def pid(self) -> int:
+        assert self.process is not None
+        return self.process.pid
+
+    def __enter__(self) -> "ServerProcess":
+        command = [
+            sys.executable, "-m", "uvicorn", self.app,
+            "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning",
+        ]
+        if self.factory:
+            command.append("--factory")
+        self.process = subprocess.Popen(command, env=self.env)
+        deadline = time.monotonic() + 30
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"server {self.app} exited with {self.process.returncode}")
+            try:
+                if httpx.get(f"{self.url}/health", timeout=1).status_code < 500:
+                    return self
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                self.__exit__(None, None, None)
+                raise RuntimeError(f"server on port {self.port} did not start")
+            time.sleep(0.05)
+
+    def __exit__(self, *exc_info) -> None:
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
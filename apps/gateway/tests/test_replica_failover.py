@@ -0,0 +1,121 @@
+"""Replica failover and breaker recovery against local stub upstreams.
+
+Run from `apps/gateway`: python -m pytest tests
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from benchmarks.stubs import ServerThread, build_stub_app, free_port
+
+RESET_SECONDS = 0.3
+
+
+def load_gateway():
+    """Import the gateway afresh, so its settings come from the current environment."""
+    for name in [name for name in sys.modules if name == "app" or name.startswith("app.")]:
+        del sys.modules[name]
+    return importlib.import_module("app.main").app
+
+
+@pytest.fixture(scope="module")
+def cluster():
+    ports = [free_port(), free_port()]
+    replicas = [ServerThread(build_stub_app(), port).__enter__() for port in ports]
+    env = {
+        "GATEWAY_ROUTES": json.dumps(
+            [
+                {"name": "stub", "path": "/stub", "upstreams": [r.url for r in replicas]},
+                {
+                    "name": "coalesced",
+                    "path": "/coalesced",
+                    "upstreams": [r.url for r in replicas],
+                    "coalesce": True,
+                },
+            ]
+        ),
+        "GATEWAY_ACCESS_LOG": "false",
+        "GATEWAY_BREAKER_FAILURES": "2",
+        "GATEWAY_BREAKER_RESET_SECONDS": str(RESET_SECONDS),
+        "GATEWAY_REPLICA_FAILURES": "1",
+        "GATEWAY_REPLICA_EJECTION_SECONDS": "60",
+    }
+    try:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            for key, value in env.items():
+                monkeypatch.setenv(key, value)
+            gateway_app = load_gateway()
+        with ServerThread(gateway_app, free_port()) as gateway:
+            with httpx.Client(base_url=gateway.url, timeout=5) as client:
+                yield client, replicas, ports
+    finally:
+        for replica in replicas:
+            replica.__exit__(None, None, None)
+        # Later imports get a gateway configured from the real environment.
+        load_gateway()
+
+
+def replica_requests(client: httpx.Client) -> list[int]:
+    upstream = client.get("/metrics").json()["upstreams"]["stub"]
+    return [r["requests"] for r in upstream["balancer"]["replicas"]]
+
+
+def breaker_state(client: httpx.Client) -> str:
+    return client.get("/routes").json()["routes"][0]["breaker"]["state"]
+
+
+def test_coalesced_failure_counts_once(cluster) -> None:
+    client, _, _ = cluster
+    with ThreadPoolExecutor(5) as executor:
+        responses = list(executor.map(lambda _: client.get("/coalesced/unavailable"), range(5)))
+    assert [r.status_code for r in responses] == [503] * 5
+
+    # Only the request that reached a replica counts against it and the breaker.
+    upstream = client.get("/metrics").json()["upstreams"]["coalesced"]
+    assert sum(r["requests"] for r in upstream["balancer"]["replicas"]) == 1
+    assert sum(r["ejections"] for r in upstream["balancer"]["replicas"]) == 1
+    breaker = client.get("/routes").json()["routes"][1]["breaker"]
+    assert (breaker["state"], breaker["failures"]) == ("closed", 1)
+
+
+def test_traffic_moves_off_a_dead_first_replica(cluster) -> None:
+    client, replicas, _ = cluster
+    for _ in range(10):
+        assert client.get("/stub/small").status_code == 200
+    assert all(count > 0 for count in replica_requests(client))
+
+    replicas[0].__exit__(None, None, None)
+    # The first request routed to the dead replica fails and ejects it.
+    statuses = [client.get("/stub/small").status_code for _ in range(10)]
+    assert statuses.count(502) <= 1
+    before = replica_requests(client)
+    for _ in range(10):
+        assert client.get("/stub/small").status_code == 200
+    after = replica_requests(client)
+    assert after[0] == before[0]
+    assert after[1] == before[1] + 10
+
+
+def test_breaker_recovers_through_another_replica(cluster) -> None:
+    client, replicas, ports = cluster
+    # Take the remaining replica down as well until the circuit opens.
+    replicas[1].__exit__(None, None, None)
+    for _ in range(5):
+        client.get("/stub/small")
+    assert breaker_state(client) == "open"
+    assert client.get("/stub/small").status_code == 503
+
+    # Only the second replica comes back; the first stays dead.
+    replicas[1] = ServerThread(build_stub_app(), ports[1]).__enter__()
+    time.sleep(RESET_SECONDS + 0.1)
+    assert client.get("/stub/small").status_code == 200
+    assert breaker_state(client) == "closed"
+    for _ in range(5):
+        assert client.get("/stub/small").status_code == 200
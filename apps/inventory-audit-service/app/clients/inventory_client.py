@@ -3,15 +3,16 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-import httpx
 from fastapi import HTTPException, status
 
+from app.core.http_clients import ServiceClient
+
 
 def resolve_item_by_barcode(
     *, token: str, inventory_service_url: str, barcode_value: str
 ) -> dict[str, Any] | None:
     try:
-        with httpx.Client(timeout=10) as client:
+        with ServiceClient(timeout=10) as client:
             response = client.post(
                 f"{inventory_service_url}/items/resolve",
                 headers={"Authorization": f"Bearer {token}"},
@@ -46,7 +47,7 @@ def list_items_by_room(
     *, token: str, inventory_service_url: str, room_id: int
 ) -> list[dict[str, Any]]:
     try:
-        with httpx.Client(timeout=10) as client:
+        with ServiceClient(timeout=10) as client:
             response = client.get(
                 f"{inventory_service_url}/items/room/{room_id}",
                 headers={"Authorization": f"Bearer {token}"},
@@ -88,7 +89,7 @@ def bulk_move_items(
         body["responsible_id"] = responsible_id
 
     try:
-        with httpx.Client(timeout=20) as client:
+        with ServiceClient(timeout=20) as client:
             response = client.post(
                 f"{inventory_service_url}/items/bulk-move",
                 headers={"Authorization": f"Bearer {token}"},
@@ -131,7 +132,7 @@ def set_item_last_inventory_at(
         headers["Authorization"] = f"Bearer {token}"
 
     try:
-        with httpx.Client(timeout=10) as client:
+        with ServiceClient(timeout=10) as client:
             response = client.put(
                 f"{inventory_service_url}/items/{item_id}",
                 headers=headers,
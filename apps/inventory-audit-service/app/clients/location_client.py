@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import httpx
 from fastapi import HTTPException, status
 
+from app.core.http_clients import ServiceClient
+
 
 def assert_room_access(*, token: str, location_service_url: str, room_id: int) -> None:
     try:
-        with httpx.Client(timeout=5) as client:
+        with ServiceClient(timeout=5) as client:
             response = client.get(
                 f"{location_service_url}/rooms/my/{room_id}",
                 headers={"Authorization": f"Bearer {token}"},
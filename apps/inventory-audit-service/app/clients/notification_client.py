@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
+from app.core.http_clients import ServiceClient
 
 
 def create_internal_notifications(
@@ -23,7 +23,7 @@ def create_internal_notifications(
         return False
 
     try:
-        with httpx.Client(timeout=5) as client:
+        with ServiceClient(timeout=5) as client:
             response = client.post(
                 f"{notification_service_url}/internal/notifications",
                 headers={"X-Internal-Token": token},
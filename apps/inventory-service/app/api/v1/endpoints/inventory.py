@@ -3,7 +3,6 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi.responses import StreamingResponse
@@ -18,6 +17,7 @@ from app.core.dependencies import (
     require_system_admin,
     security,
 )
+from app.core.http_clients import AsyncServiceClient, ServiceClient
 from app.schemas import (
     InventoryBulkMoveRequest,
     InventoryBulkMoveResult,
@@ -104,7 +104,7 @@ async def list_items_by_room(
     db: Session = Depends(get_db),
 ) -> list[InventoryItemPublic]:
     token = credentials.credentials
-    async with httpx.AsyncClient(timeout=10) as client:
+    async with AsyncServiceClient(timeout=10) as client:
         response = await client.get(
             f"{settings.location_service_url}/rooms/my/{room_id}",
             headers={"Authorization": f"Bearer {token}"},
@@ -271,7 +271,7 @@ def update_item(
     if is_moved and credentials is not None:
         token = credentials.credentials
         try:
-            with httpx.Client(timeout=5) as client:
+            with ServiceClient(timeout=5) as client:
                 response = client.post(
                     f"{settings.operations_service_url}/inventory/events",
                     headers={"Authorization": f"Bearer {token}"},
@@ -306,7 +306,7 @@ def bulk_move_items(
 
     # validate location exists (and current user is allowed to use it)
     try:
-        with httpx.Client(timeout=5) as client:
+        with ServiceClient(timeout=5) as client:
             response = client.get(
                 f"{settings.location_service_url}/rooms/{payload.location_id}",
                 headers={"Authorization": f"Bearer {token}"},
@@ -357,7 +357,7 @@ def bulk_move_items(
         if existing_ids and len(existing_ids) == len(unique_ids):
             # Generate the document BEFORE moving, so it captures the current "from" responsible/location.
             try:
-                with httpx.Client(timeout=10) as client:
+                with ServiceClient(timeout=10) as client:
                     response = client.post(
                         f"{settings.documents_service_url}/v1/documents/generate-batch",
                         headers={"Authorization": f"Bearer {token}"},
@@ -412,7 +412,7 @@ def bulk_move_items(
             continue
 
         try:
-            with httpx.Client(timeout=5) as client:
+            with ServiceClient(timeout=5) as client:
                 response = client.post(
                     f"{settings.operations_service_url}/inventory/events",
                     headers={"Authorization": f"Bearer {token}"},
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_clients import AsyncServiceClient
+from app.core.identity import IDENTITY_HEADER, verify_identity
+from app.core.jwks import claims_to_user, jwks_verifier
+from app.core.token_cache import token_cache
 from app.db import SessionLocal
 
 security = HTTPBearer()
@@ -21,16 +24,16 @@ def get_db() -> Session:
         db.close()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> dict[str, Any]:
-    token = credentials.credentials
-    async with httpx.AsyncClient(timeout=10) as client:
+async def _introspect(token: str) -> dict[str, Any] | None:
+    async with AsyncServiceClient(timeout=10) as client:
         response = await client.get(
             f"{settings.auth_service_url}/auth/me",
             headers={"Authorization": f"Bearer {token}"},
         )
 
+    # Only a definite rejection may be cached; other failures are retried.
+    if response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN):
+        return None
     if response.status_code != status.HTTP_200_OK:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_token")
 
@@ -41,6 +44,26 @@ async def get_current_user(
     return data
 
 
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict[str, Any]:
+    token = credentials.credentials
+    identity = verify_identity(request.headers.get(IDENTITY_HEADER), token)
+    if identity is not None:
+        return identity
+
+    if jwks_verifier is not None:
+        claims = await jwks_verifier.verify(token)
+        if claims is not None:
+            return claims_to_user(claims)
+
+    user = await token_cache.get_user(token, _introspect)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_token")
+    return user
+
+
 def require_system_admin(
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
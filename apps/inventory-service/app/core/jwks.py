@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.core.http_clients import AsyncServiceClient
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+
+class JWKSVerifier:
+    """Verify auth's access tokens offline against its published public keys.
+
+    Keys are refetched every `cache_seconds`, and early when a token names an
+    unknown `kid` (a rotation), at most once per `min_refresh_seconds`. If
+    auth is unreachable the last known keys keep being used.
+    """
+
+    def __init__(self, jwks_url: str, cache_seconds: float, min_refresh_seconds: float) -> None:
+        self.jwks_url = jwks_url
+        self.cache_seconds = cache_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._fetched_at = float("-inf")
+        self._attempted_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> dict[str, Any] | None:
+        """Return the access token claims, or None if this verifier cannot vouch for it."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError:
+            return None
+        kid = header.get("kid")
+        algorithm = header.get("alg")
+        if not kid or algorithm not in ALGORITHMS:
+            return None
+
+        key = await self._key(kid)
+        if key is None or key.get("alg", algorithm) != algorithm:
+            return None
+        try:
+            claims = jwt.decode(token, key, algorithms=[algorithm])
+        except JWTError:
+            return None
+        if claims.get("type") != "access" or not str(claims.get("sub") or "").isdigit():
+            return None
+        return claims
+
+    async def _key(self, kid: str) -> dict[str, Any] | None:
+        now = time.monotonic()
+        stale = now - self._fetched_at >= self.cache_seconds
+        if stale or kid not in self._keys:
+            await self._refresh(now)
+        return self._keys.get(kid)
+
+    async def _refresh(self, requested_at: float) -> None:
+        async with self._lock:
+            # Someone else refreshed, or tried to, while we waited.
+            if self._attempted_at >= requested_at or time.monotonic() - self._attempted_at < self.min_refresh_seconds:
+                return
+            self._attempted_at = time.monotonic()
+            try:
+                async with AsyncServiceClient(timeout=5) as client:
+                    response = await client.get(self.jwks_url)
+                response.raise_for_status()
+                keys = {key["kid"]: key for key in response.json()["keys"] if key.get("kid")}
+            except Exception as exc:  # noqa: BLE001 - keep serving with the last known keys
+                logger.warning("JWKS refresh from %s failed: %s", self.jwks_url, exc)
+                return
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+
+def claims_to_user(claims: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": int(claims["sub"]),
+        "roles": list(claims.get("roles") or []),
+        "permissions": list(claims.get("permissions") or []),
+    }
+
+
+jwks_verifier = (
+    JWKSVerifier(
+        settings.jwks_url,
+        cache_seconds=settings.jwks_cache_seconds,
+        min_refresh_seconds=settings.jwks_min_refresh_seconds,
+    )
+    if settings.jwks_url
+    else None
+)
@@ -4,17 +4,16 @@ import csv
 import io
 import json
 import re
-import uuid
 from dataclasses import dataclass
 from collections.abc import AsyncIterator
 from typing import Any, Iterable
 
-import httpx
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_clients import AsyncServiceClient
 from app.models import Barcode, InventoryItem, InventoryItemBarcode
 from app.schemas.barcode import BarcodeCreate
 from app.schemas.inventory_import import (
@@ -150,6 +149,100 @@ def _looks_like_email(value: str | None) -> bool:
     return bool(_EMAIL_RE.match(value.strip().lower()))
 
 
+def _responsible_email(data: InventoryImportItemData) -> str | None:
+    if data.responsible_username and _looks_like_email(data.responsible_username):
+        return data.responsible_username.strip().lower()
+    return None
+
+
+# Emails per call to auth's batch endpoints.
+_USER_BATCH_SIZE = 1000
+
+
+async def _lookup_users_by_email(client: AsyncServiceClient, token: str, emails: list[str]) -> dict[str, int]:
+    found: dict[str, int] = {}
+    for start in range(0, len(emails), _USER_BATCH_SIZE):
+        resp = await client.post(
+            f"{settings.auth_service_url}/auth/users/lookup-by-email",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"emails": emails[start:start + _USER_BATCH_SIZE]},
+        )
+        if resp.status_code != status.HTTP_200_OK:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="auth_service_error")
+        data = resp.json()
+        users = data.get("users") if isinstance(data, dict) else None
+        if not isinstance(users, dict):
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="auth_service_invalid_response")
+        found.update({email: uid for email, uid in users.items() if isinstance(uid, int)})
+    return found
+
+
+async def _create_users(
+    client: AsyncServiceClient, token: str, users: dict[str, InventoryImportItemData]
+) -> dict[str, int]:
+    # Created without a password: they sign in via Platonus or once an admin sets one.
+    items = [
+        {
+            "email": email,
+            "full_name": " ".join(
+                [p for p in [data.responsible_first_name, data.responsible_last_name] if p]
+            ).strip() or None,
+            "first_name": data.responsible_first_name,
+            "last_name": data.responsible_last_name,
+            "is_active": True,
+        }
+        for email, data in users.items()
+    ]
+    created: dict[str, int] = {}
+    for start in range(0, len(items), _USER_BATCH_SIZE):
+        resp = await client.post(
+            f"{settings.auth_service_url}/admin/users/bulk",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"users": items[start:start + _USER_BATCH_SIZE], "role_ids": []},
+        )
+        if resp.status_code != status.HTTP_200_OK:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="auth_service_error")
+        data = resp.json()
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="auth_service_invalid_response")
+        for key in ("existing", "created"):
+            if isinstance(data.get(key), dict):
+                created.update({email: uid for email, uid in data[key].items() if isinstance(uid, int)})
+    return created
+
+
+async def _resolve_responsible_users(
+    client: AsyncServiceClient,
+    token: str,
+    rows: list[InventoryImportPreviewRow],
+    create_missing_users: bool,
+) -> tuple[dict[str, int], str | None]:
+    """Resolve (and optionally create) every responsible email up front.
+
+    Returns the email -> id map and the error detail for rows whose user
+    could not be resolved because auth failed.
+    """
+    pending: dict[str, InventoryImportItemData] = {}
+    for row in rows:
+        email = _responsible_email(row.data)
+        if row.action == "create" and row.data.responsible_id is None and email:
+            pending.setdefault(email, row.data)
+    if not pending:
+        return {}, None
+
+    resolved: dict[str, int] = {}
+    try:
+        resolved.update(await _lookup_users_by_email(client, token, sorted(pending)))
+        missing = {email: data for email, data in pending.items() if email not in resolved}
+        if missing and create_missing_users:
+            resolved.update(await _create_users(client, token, missing))
+    except HTTPException as exc:
+        return resolved, exc.detail
+    except Exception:
+        return resolved, "auth_service_error"
+    return resolved, None
+
+
 def _coerce_status(value: str | None) -> object:
     if value is None:
         return None
@@ -367,7 +460,7 @@ async def build_preview(
         }
     )
 
-    async with httpx.AsyncClient(timeout=20) as client:
+    async with AsyncServiceClient(timeout=20) as client:
         if unique_room_names:
             try:
                 resp = await client.get(
@@ -388,31 +481,14 @@ async def build_preview(
                 # preview should still work without external resolution
                 pass
 
-        for email in unique_user_emails:
-            normalized_email = email.strip().lower()
-            if not normalized_email:
-                continue
+        if unique_user_emails:
             try:
-                resp = await client.get(
-                    f"{settings.auth_service_url}/auth/users/search",
-                    headers={"Authorization": f"Bearer {token}"},
-                    params={"q": normalized_email, "limit": 20, "offset": 0},
+                user_email_to_id = await _lookup_users_by_email(
+                    client, token, sorted({email.lower() for email in unique_user_emails})
                 )
-                if resp.status_code != status.HTTP_200_OK:
-                    continue
-                data = resp.json()
-                if not isinstance(data, list):
-                    continue
-                for item in data:
-                    if not isinstance(item, dict):
-                        continue
-                    uid = item.get("id")
-                    uemail = item.get("email")
-                    if isinstance(uid, int) and isinstance(uemail, str) and uemail.strip().lower() == normalized_email:
-                        user_email_to_id[normalized_email] = uid
-                        break
             except Exception:
-                continue
+                # preview should still work without external resolution
+                pass
 
     seen_barcode_values: set[str] = set()
     duplicate_barcode_values: set[str] = set()
@@ -535,9 +611,8 @@ async def confirm_import(
 
     # Cache for this import run
     room_name_to_id: dict[str, int] = {}
-    user_email_to_id: dict[str, int] = {}
 
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with AsyncServiceClient(timeout=30) as client:
         # preload rooms for name -> id resolution and idempotent creation
         try:
             resp = await client.get(
@@ -555,6 +630,10 @@ async def confirm_import(
         except Exception:
             pass
 
+        user_email_to_id, users_error = await _resolve_responsible_users(
+            client, token, preview.rows, create_missing_users
+        )
+
         for row in preview.rows:
             if row.action == "skip_existing":
                 skipped_count += 1
@@ -590,65 +669,16 @@ async def confirm_import(
                         location_id = int(created["id"])
                         room_name_to_id[key] = location_id
 
-                # Resolve / create responsible user
+                # Resolve responsible user (looked up / created in bulk above)
                 responsible_id = data.responsible_id
-                email = (
-                    data.responsible_username.strip().lower()
-                    if data.responsible_username and _looks_like_email(data.responsible_username)
-                    else None
-                )
+                email = _responsible_email(data)
                 if responsible_id is None and email:
                     responsible_id = user_email_to_id.get(email)
-                    if responsible_id is None:
-                        resp = await client.get(
-                            f"{settings.auth_service_url}/auth/users/search",
-                            headers={"Authorization": f"Bearer {token}"},
-                            params={"q": email, "limit": 20, "offset": 0},
-                        )
-                        if resp.status_code == status.HTTP_200_OK and isinstance(resp.json(), list):
-                            for item in resp.json():
-                                if not isinstance(item, dict):
-                                    continue
-                                uid = item.get("id")
-                                uemail = item.get("email")
-                                if isinstance(uid, int) and isinstance(uemail, str) and uemail.strip().lower() == email:
-                                    responsible_id = uid
-                                    break
-
                     if responsible_id is None and create_missing_users:
-                        password = uuid.uuid4().hex + "Aa1!"
-                        full_name = " ".join(
-                            [p for p in [data.responsible_first_name, data.responsible_last_name] if p]
-                        ).strip() or None
-                        resp = await client.post(
-                            f"{settings.auth_service_url}/admin/users",
-                            headers={"Authorization": f"Bearer {token}"},
-                            json={
-                                "email": email,
-                                "password": password,
-                                "full_name": full_name,
-                                "first_name": data.responsible_first_name,
-                                "last_name": data.responsible_last_name,
-                                "role": None,
-                                "role_ids": [],
-                                "is_active": True,
-                            },
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail=users_error or "responsible_user_not_created",
                         )
-                        if resp.status_code != status.HTTP_201_CREATED:
-                            raise HTTPException(
-                                status_code=status.HTTP_502_BAD_GATEWAY,
-                                detail="auth_service_error",
-                            )
-                        created = resp.json()
-                        if not isinstance(created, dict) or not isinstance(created.get("id"), int):
-                            raise HTTPException(
-                                status_code=status.HTTP_502_BAD_GATEWAY,
-                                detail="auth_service_invalid_response",
-                            )
-                        responsible_id = int(created["id"])
-
-                    if responsible_id is not None:
-                        user_email_to_id[email] = responsible_id
 
                 # Resolve / create barcode
                 barcode_id = data.barcode_id
@@ -771,9 +801,8 @@ def confirm_import_stream(
         error_rows: list[dict[str, Any]] = []
 
         room_name_to_id: dict[str, int] = {}
-        user_email_to_id: dict[str, int] = {}
 
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with AsyncServiceClient(timeout=30) as client:
             try:
                 resp = await client.get(
                     f"{settings.location_service_url}/rooms",
@@ -790,6 +819,10 @@ def confirm_import_stream(
             except Exception:
                 pass
 
+            user_email_to_id, users_error = await _resolve_responsible_users(
+                client, token, preview.rows, create_missing_users
+            )
+
             total = len(preview.rows)
             for index, row in enumerate(preview.rows, start=1):
                 if row.action == "skip_existing":
@@ -855,74 +888,14 @@ def confirm_import_stream(
                             room_name_to_id[key] = location_id
 
                     responsible_id = data.responsible_id
-                    email = (
-                        data.responsible_username.strip().lower()
-                        if data.responsible_username and _looks_like_email(data.responsible_username)
-                        else None
-                    )
+                    email = _responsible_email(data)
                     if responsible_id is None and email:
                         responsible_id = user_email_to_id.get(email)
-                        if responsible_id is None:
-                            resp = await client.get(
-                                f"{settings.auth_service_url}/auth/users/search",
-                                headers={"Authorization": f"Bearer {token}"},
-                                params={"q": email, "limit": 20, "offset": 0},
-                            )
-                            if resp.status_code == status.HTTP_200_OK and isinstance(resp.json(), list):
-                                for item in resp.json():
-                                    if not isinstance(item, dict):
-                                        continue
-                                    uid = item.get("id")
-                                    uemail = item.get("email")
-                                    if (
-                                        isinstance(uid, int)
-                                        and isinstance(uemail, str)
-                                        and uemail.strip().lower() == email
-                                    ):
-                                        responsible_id = uid
-                                        break
-
                         if responsible_id is None and create_missing_users:
-                            password = uuid.uuid4().hex + "Aa1!"
-                            full_name = " ".join(
-                                [
-                                    p
-                                    for p in [
-                                        data.responsible_first_name,
-                                        data.responsible_last_name,
-                                    ]
-                                    if p
-                                ]
-                            ).strip() or None
-                            resp = await client.post(
-                                f"{settings.auth_service_url}/admin/users",
-                                headers={"Authorization": f"Bearer {token}"},
-                                json={
-                                    "email": email,
-                                    "password": password,
-                                    "full_name": full_name,
-                                    "first_name": data.responsible_first_name,
-                                    "last_name": data.responsible_last_name,
-                                    "role": None,
-                                    "role_ids": [],
-                                    "is_active": True,
-                                },
+                            raise HTTPException(
+                                status_code=status.HTTP_502_BAD_GATEWAY,
+                                detail=users_error or "responsible_user_not_created",
                             )
-                            if resp.status_code != status.HTTP_201_CREATED:
-                                raise HTTPException(
-                                    status_code=status.HTTP_502_BAD_GATEWAY,
-                                    detail="auth_service_error",
-                                )
-                            created = resp.json()
-                            if not isinstance(created, dict) or not isinstance(created.get("id"), int):
-                                raise HTTPException(
-                                    status_code=status.HTTP_502_BAD_GATEWAY,
-                                    detail="auth_service_invalid_response",
-                                )
-                            responsible_id = int(created["id"])
-
-                        if responsible_id is not None:
-                            user_email_to_id[email] = responsible_id
 
                     barcode_id = data.barcode_id
                     normalized_value = _normalize_barcode(data.barcode_data_12)
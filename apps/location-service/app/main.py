@@ -3,11 +3,25 @@ from __future__ import annotations
 from fastapi import FastAPI
 
 from app.api.v1.router import router as api_v1_router
+from app.core.http_clients import service_clients
+from app.core.token_cache import token_cache
+from app.core.tracing import TracingMiddleware
 
 app = FastAPI(title="Location Service")
 app.include_router(api_v1_router)
+app.add_middleware(TracingMiddleware)
 
 
 @app.get("/health")
 def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics() -> dict:
+    return {"token_cache": token_cache.snapshot()}
+
+
+@app.on_event("shutdown")
+async def close_service_clients() -> None:
+    await service_clients.aclose()
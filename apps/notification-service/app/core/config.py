@@ -13,6 +13,20 @@ class Settings:
         )
 
         self.auth_service_url = os.getenv("AUTH_SERVICE_URL", "http://auth:8000")
+        self.identity_secret = os.getenv("IDENTITY_SECRET", "")
+        # Verify RS256/ES256 access tokens locally against auth's JWKS; empty disables.
+        self.jwks_url = os.getenv("JWKS_URL", "")
+        self.jwks_cache_seconds = float(os.getenv("JWKS_CACHE_SECONDS", "300"))
+        self.jwks_min_refresh_seconds = float(os.getenv("JWKS_MIN_REFRESH_SECONDS", "30"))
+        # /auth/me answers cached per token; 0 disables the cache.
+        self.token_cache_ttl_seconds = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "30"))
+        self.token_cache_negative_ttl_seconds = float(os.getenv("TOKEN_CACHE_NEGATIVE_TTL_SECONDS", "5"))
+        self.token_cache_max_entries = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+        # Keep-alive pool per target service for outgoing calls.
+        self.http_client_timeout_seconds = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+        self.http_client_max_connections = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "20"))
+        self.http_client_max_keepalive_connections = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "10"))
+        self.http_client_keepalive_expiry = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30"))
         self.internal_token = os.getenv("NOTIFICATION_INTERNAL_TOKEN", "")
 
 
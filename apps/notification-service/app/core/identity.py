@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Any
+
+from app.core.config import settings
+
+IDENTITY_HEADER = "X-Identity"
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def verify_identity(envelope: str | None, token: str) -> dict[str, Any] | None:
+    """Return the user signed by the gateway, or None to fall back to /auth/me."""
+    if not envelope or not settings.identity_secret:
+        return None
+
+    body, _, signature = envelope.partition(".")
+    if not body or not signature:
+        return None
+
+    expected = hmac.new(
+        settings.identity_secret.encode("utf-8"),
+        body.encode("ascii", errors="replace"),
+        hashlib.sha256,
+    ).digest()
+    try:
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            return None
+        payload = json.loads(_b64decode(body))
+    except (binascii.Error, ValueError):
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("tid") != token_fingerprint(token):
+        return None
+    exp = payload.get("exp")
+    if not isinstance(exp, int) or exp <= time.time():
+        return None
+
+    return {
+        "id": payload.get("id"),
+        "roles": list(payload.get("roles") or []),
+        "permissions": list(payload.get("permissions") or []),
+    }
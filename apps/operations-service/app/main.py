@@ -4,12 +4,25 @@ from fastapi import FastAPI
 
 from app.api.v1.router import router as api_v1_router
 from app.core.config import settings
+from app.core.http_clients import service_clients
+from app.core.token_cache import token_cache
+from app.core.tracing import TracingMiddleware
 
 app = FastAPI(title="Operations Service", version="1.0.0")
 app.include_router(api_v1_router)
+app.add_middleware(TracingMiddleware)
 
 
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok", "env": settings.env}
 
+
+@app.get("/metrics")
+def metrics() -> dict:
+    return {"token_cache": token_cache.snapshot()}
+
+
+@app.on_event("shutdown")
+async def close_service_clients() -> None:
+    await service_clients.aclose()
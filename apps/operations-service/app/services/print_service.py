@@ -8,6 +8,7 @@ import httpx
 from fastapi import HTTPException, status
 
 from app.core.config import settings
+from app.core.tracing import http_client
 from app.schemas.print import PrintRequest, PrintResponse
 
 
@@ -47,7 +48,8 @@ def forward_print_request(
         body["client_ip"] = client_ip
 
     try:
-        response = httpx.post(url, json=body, timeout=timeout)
+        with http_client(timeout=timeout) as client:
+            response = client.post(url, json=body)
     except httpx.RequestError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,